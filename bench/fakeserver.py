@@ -0,0 +1,149 @@
+import io
+import json
+import random
+import hashlib
+import zipfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from requests.adapters import HTTPAdapter
+
+# -------------------------
+# Local API Stand-in
+# -------------------------
+# Serves just enough of Modrinth, Fabric/Quilt meta and the Mojang manifest
+# for the launcher's own code paths. Requests arrive as /<original host>/<path>;
+# LocalAdapter rewrites https:// URLs on a requests session to match, so the
+# code under test runs unchanged.
+
+class PackSpec:
+    def __init__(self, files=200, file_size=256 * 1024, override_files=100, override_size=16 * 1024, seed=1):
+        self.files = files
+        self.file_size = file_size
+        self.override_files = override_files
+        self.override_size = override_size
+        self.seed = seed
+
+
+def build_mrpack(project_id, spec):
+    # Returns (mrpack bytes, {cdn path: file bytes}). Every mod is distinct so
+    # the artifact store can't dedupe within one pack.
+    rng = random.Random(f"{spec.seed}-{project_id}")
+    files, index_files = {}, []
+    for i in range(spec.files):
+        data = rng.randbytes(spec.file_size)
+        path = f"/cdn.modrinth.com/data/{project_id}/mod{i}.jar"
+        files[path] = data
+        index_files.append({
+            "path": f"mods/mod{i}.jar",
+            "hashes": {"sha1": hashlib.sha1(data).hexdigest(), "sha512": hashlib.sha512(data).hexdigest()},
+            "downloads": [f"https://cdn.modrinth.com/data/{project_id}/mod{i}.jar"],
+            "fileSize": len(data),
+        })
+    index = {"formatVersion": 1, "game": "minecraft", "versionId": "1.0.0", "name": f"Bench {project_id}",
+             "dependencies": {"minecraft": "1.20.1", "fabric-loader": "0.15.11"}, "files": index_files}
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("modrinth.index.json", json.dumps(index))
+        for i in range(spec.override_files):
+            prefix = "client-overrides" if i % 10 == 0 else "overrides"
+            z.writestr(f"{prefix}/config/bench/file{i}.txt", rng.randbytes(spec.override_size))
+    return buf.getvalue(), files
+
+
+class FakeApi:
+    def __init__(self, spec=None, projects=50, versions=300, loaders=200):
+        self.spec = spec or PackSpec()
+        self.projects = [f"bench{i:04d}" for i in range(projects)]
+        self.routes = {}
+        self.packs = {}
+        self._lock = threading.Lock()
+        manifest = {"latest": {"release": "1.20.1"}, "versions": [{"id": f"1.{i // 10}.{i % 10}", "type": "release" if i % 3 else "snapshot", "url": "", "time": "", "releaseTime": ""} for i in range(versions)]}
+        loader_list = [{"version": f"0.{15 - i // 100}.{i % 100}", "stable": i % 4 == 0, "build": i} for i in range(loaders)]
+        self.routes["/launchermeta.mojang.com/mc/game/version_manifest_v2.json"] = json.dumps(manifest).encode()
+        self.routes["/meta.fabricmc.net/v2/versions/loader"] = json.dumps(loader_list).encode()
+        self.routes["/meta.quiltmc.org/v3/versions/loader"] = json.dumps(loader_list).encode()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def pack(self, project_id):
+        # Built on first request and kept, like a CDN would
+        with self._lock:
+            if project_id not in self.packs:
+                data, files = build_mrpack(project_id, self.spec)
+                self.packs[project_id] = data
+                self.routes.update(files)
+                self.routes[f"/cdn.modrinth.com/data/{project_id}/pack.mrpack"] = data
+            return self.packs[project_id]
+
+    def search(self, query):
+        q = query.get("query", [""])[0]
+        offset, limit = int(query.get("offset", ["0"])[0]), int(query.get("limit", ["20"])[0])
+        hits = [p for p in self.projects if q in p]
+        page = [{"project_id": p, "slug": p, "title": f"Bench {p}", "description": "Synthetic pack", "icon_url": "", "downloads": 0} for p in hits[offset:offset + limit]]
+        return {"hits": page, "offset": offset, "limit": limit, "total_hits": len(hits)}
+
+    def versions(self, project_id):
+        data = self.pack(project_id)
+        return [{"id": "v1", "project_id": project_id, "files": [{
+            "url": f"https://cdn.modrinth.com/data/{project_id}/pack.mrpack", "filename": f"{project_id}.mrpack", "primary": True,
+            "size": len(data), "hashes": {"sha1": hashlib.sha1(data).hexdigest(), "sha512": hashlib.sha512(data).hexdigest()},
+        }]}]
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args): pass
+
+            def do_GET(self):
+                u = urlsplit(self.path)
+                if u.path == "/api.modrinth.com/v2/search":
+                    body = json.dumps(api.search(parse_qs(u.query))).encode()
+                elif u.path.startswith("/api.modrinth.com/v2/project/") and u.path.endswith("/version"):
+                    body = json.dumps(api.versions(u.path.split("/")[4])).encode()
+                else:
+                    if u.path.startswith("/cdn.modrinth.com/data/"): api.pack(u.path.split("/")[3])
+                    body = api.routes.get(u.path)
+                if body is None:
+                    self.send_response(404); self.send_header("Content-Length", "0"); self.end_headers(); return
+                # Metadata gets an ETag so MetaCache can revalidate; file bodies don't
+                etag = None if u.path.startswith("/cdn.") else '"%s"' % hashlib.sha1(body).hexdigest()
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304); self.send_header("ETag", etag); self.send_header("Content-Length", "0"); self.end_headers(); return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                if etag: self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+class LocalAdapter(HTTPAdapter):
+    # https://host/path -> <base>/host/path
+    def __init__(self, base, **kwargs):
+        super().__init__(**kwargs)
+        self.base = base
+
+    def send(self, request, **kwargs):
+        u = urlsplit(request.url)
+        request.url = f"{self.base}/{u.netloc}{u.path}" + (f"?{u.query}" if u.query else "")
+        return super().send(request, **kwargs)
+
+
+def redirect_session(session, base, pool_size=16):
+    session.mount("https://", LocalAdapter(base, pool_connections=pool_size, pool_maxsize=pool_size))
+    return session
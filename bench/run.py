@@ -0,0 +1,236 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+# -------------------------
+# Offline Benchmarks
+# -------------------------
+# python -m bench [--output bench.json] [--only case,...]
+# Everything runs in a throwaway .minecraft (ORBUS_MINECRAFT_DIR) against the
+# local stand-in in bench/fakeserver.py, so results only depend on this
+# machine. Output is one JSON document: parameters, environment, and
+# min/median/mean/max seconds per case.
+CASES = ("modrinth_search", "meta_fabric_loaders", "download_mrpack", "install_mrpack", "install_mrpack_warm",
+         "install_from_modrinth", "install_basic_zip", "java_scan", "java_scan_cached",
+         "config_save", "config_save_one", "config_load_sidebar", "config_load_all",
+         "command_build", "command_cached")
+
+
+def summarize(samples, **extra):
+    return dict(runs=len(samples), min=min(samples), median=statistics.median(samples), mean=statistics.fmean(samples), max=max(samples), **extra)
+
+def timed(runs, fn, setup=None):
+    samples = []
+    for _ in range(runs):
+        if setup: setup()
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return samples
+
+
+# --- Fixtures ---
+def make_fake_jdks(root, count, noise_files):
+    # bin/java scripts that answer -version like a real JDK, plus some
+    # unrelated files so the directory walk has something to chew on.
+    for i in range(count):
+        jdk = os.path.join(root, f"jdk-{17 + i % 5}.0.{i}")
+        os.makedirs(os.path.join(jdk, "bin"))
+        java = os.path.join(jdk, "bin", "java")
+        with open(java, "w") as f:
+            f.write(f"#!/bin/sh\necho 'openjdk version \"{17 + i % 5}.0.{i}\" 2024-01-16' >&2\necho 'OpenJDK 64-Bit Server VM (build {17 + i % 5}.0.{i}, mixed mode)' >&2\n")
+        os.chmod(java, 0o755)
+        lib = os.path.join(jdk, "lib", "modules")
+        os.makedirs(lib)
+        for n in range(noise_files): open(os.path.join(lib, f"m{n}.jmod"), "w").close()
+
+def make_fake_versions(mc_dir, libraries):
+    # A vanilla-shaped version plus a Fabric-style child inheriting from it
+    def write(vid, data):
+        d = os.path.join(mc_dir, "versions", vid)
+        os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, f"{vid}.json"), "w") as f: json.dump(data, f)
+    libs = [{"name": f"org.bench:lib{i}:1.0", "downloads": {"artifact": {"path": f"org/bench/lib{i}/1.0/lib{i}-1.0.jar", "url": "", "sha1": "", "size": 0}}} for i in range(libraries)]
+    write("bench-1.20.1", {
+        "id": "bench-1.20.1", "type": "release", "mainClass": "net.minecraft.client.main.Main", "assets": "bench", "assetIndex": {"id": "bench"}, "libraries": libs,
+        "arguments": {"game": ["--username", "${auth_player_name}", "--version", "${version_name}", "--gameDir", "${game_directory}", "--assetsDir", "${assets_root}",
+                               "--assetIndex", "${assets_index_name}", "--uuid", "${auth_uuid}", "--accessToken", "${auth_access_token}"],
+                      "jvm": ["-Djava.library.path=${natives_directory}", "-cp", "${classpath}"]}})
+    write("fabric-loader-bench-1.20.1", {
+        "id": "fabric-loader-bench-1.20.1", "inheritsFrom": "bench-1.20.1", "mainClass": "net.fabricmc.loader.impl.launch.knot.KnotClient",
+        "arguments": {"game": [], "jvm": []}, "libraries": [{"name": f"net.fabricmc:bench{i}:1.0", "url": "https://maven.fabricmc.net/"} for i in range(libraries // 5)]})
+    return "fabric-loader-bench-1.20.1"
+
+def make_plain_zip(path, files, size):
+    import zipfile
+    with zipfile.ZipFile(path, "w") as z:
+        for i in range(files): z.writestr(f"mods/plain{i}.jar", os.urandom(size))
+        z.writestr("options.txt", "fov:0.0\n")
+
+
+# --- Run ---
+def run(args, work):
+    from bench.fakeserver import FakeApi, PackSpec, redirect_session
+    from orbus import paths
+    from orbus.core import Orbus, new_instance
+
+    api = FakeApi(PackSpec(args.mrpack_files, args.file_size, args.override_files, args.override_size), projects=args.search_hits).start()
+    core = Orbus()
+    core.instances.debounce = 3600  # keep background config flushes out of the timings
+    redirect_session(core.downloader.session, api.base)
+    results, wanted = {}, set(args.only.split(",")) if args.only else set(CASES)
+
+    def case(name, samples, **extra):
+        if samples: results[name] = summarize(samples, **extra)
+
+    def want(name):
+        return name in wanted
+
+    try:
+        if want("modrinth_search"):
+            from orbus.modrinth import ModrinthSearch
+            case("modrinth_search", timed(args.runs, lambda: ModrinthSearch(core.downloader.session).search("bench", 0)), hits=args.search_hits)
+
+        if want("meta_fabric_loaders"):
+            from orbus.metacache import FABRIC_LOADERS_URL
+            def reset_meta():
+                shutil.rmtree(paths.META_CACHE_DIR, ignore_errors=True)
+                core.__dict__.pop("meta", None)
+            case("meta_fabric_loaders", timed(args.runs, lambda: core.meta.latest_loader(FABRIC_LOADERS_URL), setup=reset_meta))
+
+        if want("download_mrpack"):
+            api.pack("bench0000")  # built outside the timing
+            def clear_downloads(): shutil.rmtree(paths.DOWNLOADS_DIR, ignore_errors=True)
+            case("download_mrpack", timed(args.runs, lambda: core.download_modrinth_pack("bench0000"), setup=clear_downloads), bytes=len(api.packs["bench0000"]))
+
+        counter = iter(range(10 ** 6))
+        if any(want(c) for c in ("install_mrpack", "install_mrpack_warm")): pack = core.download_modrinth_pack("bench0000")
+        def fresh_store():
+            for name in list(core.instances): del core.instances[name]
+            shutil.rmtree(paths.STORE_DIR, ignore_errors=True)
+            shutil.rmtree(paths.INSTANCES_DIR, ignore_errors=True)
+            core.__dict__.pop("store", None)
+        def import_pack(): core.import_pack(pack, name=f"pack{next(counter)}", prefetch=False)
+        mods_bytes = args.mrpack_files * args.file_size
+
+        if want("install_mrpack"):
+            # Cold: every mod comes over the (local) network
+            case("install_mrpack", timed(args.runs, import_pack, setup=fresh_store), files=args.mrpack_files, bytes=mods_bytes)
+        if want("install_mrpack_warm"):
+            # Same pack again: mods come from the artifact store
+            fresh_store(); import_pack()
+            case("install_mrpack_warm", timed(args.runs, import_pack), files=args.mrpack_files, bytes=mods_bytes)
+        if want("install_from_modrinth"):
+            # Pack download + process_modpack, what the Install button does
+            def clean_slate():
+                fresh_store()
+                shutil.rmtree(paths.DOWNLOADS_DIR, ignore_errors=True)
+            case("install_from_modrinth", timed(args.runs, lambda: core.import_pack(core.download_modrinth_pack("bench0000"), name=f"pack{next(counter)}", prefetch=False), setup=clean_slate), files=args.mrpack_files)
+        if want("install_basic_zip"):
+            plain = os.path.join(work, "plain.zip")
+            make_plain_zip(plain, args.mrpack_files, args.file_size)
+            case("install_basic_zip", timed(args.runs, lambda: core.import_pack(plain, name=f"zip{next(counter)}", prefetch=False), setup=fresh_store), files=args.mrpack_files)
+
+        if (want("java_scan") or want("java_scan_cached")) and sys.platform != "win32":
+            from orbus.java import find_system_javas_enhanced
+            jdk_root = os.path.join(work, "jvm")
+            make_fake_jdks(jdk_root, args.jdks, args.jdk_noise)
+            cache_file = os.path.join(work, "java_cache.json")
+            def clear_java_cache():
+                try: os.remove(cache_file)
+                except OSError: pass
+            scan = lambda: find_system_javas_enhanced(cache_file=cache_file, search_dirs=[jdk_root])
+            if want("java_scan"): case("java_scan", timed(args.runs, scan, setup=clear_java_cache), jdks=args.jdks, found=len(scan()))
+            if want("java_scan_cached"): case("java_scan_cached", timed(args.runs, scan), jdks=args.jdks)
+
+        if any(want(c) for c in ("config_save", "config_save_one", "config_load_sidebar", "config_load_all")):
+            from orbus.config import InstanceStore
+            root = os.path.join(work, "config")
+            def populate():
+                shutil.rmtree(root, ignore_errors=True)
+                store = InstanceStore(root)
+                for i in range(args.instances): store[f"Instance {i}"] = new_instance(username="bench", version=f"1.20.{i % 7}", loader="Fabric", java_path=f"/opt/jdk-{i}/bin/java")
+                return store
+            if want("config_save"):
+                stores = []
+                case("config_save", timed(args.runs, lambda: stores[-1].flush(), setup=lambda: stores.append(populate())), instances=args.instances)
+            store = populate(); store.flush()
+            if want("config_save_one"):
+                def touch(): store["Instance 0"]["ram"] = store["Instance 0"].get("ram", 4) % 16 + 1
+                case("config_save_one", timed(args.runs, store.flush, setup=touch), instances=args.instances)
+            if want("config_load_sidebar"):
+                def sidebar():
+                    s = InstanceStore(root)
+                    for name in s: s.field(name, "icon_path")
+                case("config_load_sidebar", timed(args.runs, sidebar), instances=args.instances)
+            if want("config_load_all"):
+                def load_all():
+                    s = InstanceStore(root)
+                    for name in s: s[name]
+                case("config_load_all", timed(args.runs, load_all), instances=args.instances)
+
+        if want("command_build") or want("command_cached"):
+            from orbus.cmdcache import CommandCache, build_command
+            version_id = make_fake_versions(paths.MINECRAFT_DIR, args.libraries)
+            inst_dir = core.instance_dir("cmd")
+            jvm_args = ["-Xmx4G", "-Xms4G"]
+            build_command(version_id, paths.MINECRAFT_DIR, "java", jvm_args, inst_dir)  # first-import cost stays out of the numbers
+            if want("command_build"):
+                case("command_build", timed(args.runs, lambda: build_command(version_id, paths.MINECRAFT_DIR, "java", jvm_args, inst_dir)), libraries=args.libraries)
+            if want("command_cached"):
+                cache = CommandCache(os.path.join(work, "cmd_cache.json"), paths.MINECRAFT_DIR)
+                cache.get(version_id, "java", jvm_args, inst_dir, "bench")
+                case("command_cached", timed(args.runs, lambda: cache.get(version_id, "java", jvm_args, inst_dir, "bench")), libraries=args.libraries)
+    finally:
+        api.stop()
+    return results
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="bench", description="Offline Orbus benchmarks.")
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--only", help=f"comma-separated subset of: {', '.join(CASES)}")
+    p.add_argument("--mrpack-files", type=int, default=200)
+    p.add_argument("--file-size", type=int, default=256 * 1024)
+    p.add_argument("--override-files", type=int, default=100)
+    p.add_argument("--override-size", type=int, default=16 * 1024)
+    p.add_argument("--search-hits", type=int, default=50)
+    p.add_argument("--jdks", type=int, default=12)
+    p.add_argument("--jdk-noise", type=int, default=200, help="extra files per fake JDK")
+    p.add_argument("--instances", type=int, default=500)
+    p.add_argument("--libraries", type=int, default=120)
+    p.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    p.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    args = p.parse_args(argv)
+    if args.only:
+        unknown = set(args.only.split(",")) - set(CASES)
+        if unknown: p.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    work = tempfile.mkdtemp(prefix="orbus-bench-")
+    # Must be set before anything imports orbus.paths
+    os.environ["ORBUS_MINECRAFT_DIR"] = os.path.join(work, "minecraft")
+    try:
+        started = time.time()
+        results = run(args, work)
+        report = {
+            "version": 1,
+            "started": started,
+            "duration": time.time() - started,
+            "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "keep")},
+            "results": results,
+        }
+    finally:
+        if args.keep: print(f"scratch directory: {work}", file=sys.stderr)
+        else: shutil.rmtree(work, ignore_errors=True)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f: f.write(text + "\n")
+    else: print(text)
+    return 0
@@ -1,17 +1,28 @@
 import os
 import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Headless: "python launcher.py <command> ..." never loads Tk
+    from orbus.cli import main
+    sys.exit(main())
+
+import time
 import subprocess
-import threading
-import json
 import shutil
-import zipfile
 import requests
-import io
-import re
 import customtkinter as ctk
 from tkinter import filedialog, messagebox, simpledialog, Menu
 from PIL import Image, ImageTk
-import minecraft_launcher_lib
+from orbus.core import Orbus, new_instance
+from orbus.fsutil import clone_tree
+from orbus.icons import IconService
+from orbus.modrinth import ModrinthSearch
+from orbus.tasks import PRIORITY_LAUNCH, PRIORITY_BACKGROUND
+from orbus.gamelog import LogRing, SessionLog, list_sessions
+from orbus.jvmargs import PROFILES, DEFAULT_PROFILE, OS_RESERVE_MB, host_memory
+from orbus.launchtimes import LaunchTimer, PHASE_LABELS
+from orbus.paths import INSTANCES_DIR, ICON_CACHE_DIR, ICON_PATH
+from orbus.metacache import MOJANG_MANIFEST_URL, FABRIC_LOADERS_URL, QUILT_LOADERS_URL, release_ids, loader_ids
 
 # -------------------------
 # Configuration & Globals
@@ -19,91 +30,49 @@ import minecraft_launcher_lib
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
-def get_minecraft_dir():
-    if sys.platform.startswith("win"):
-        return os.path.join(os.environ["APPDATA"], ".minecraft")
-    return os.path.expanduser("~/.minecraft")
-
-MINECRAFT_DIR = get_minecraft_dir()
-INSTANCES_DIR = os.path.join(MINECRAFT_DIR, "orbus_instances")
-CONFIG_FILE = os.path.join(MINECRAFT_DIR, "orbus_config.json")
-ICON_PATH = os.path.join(MINECRAFT_DIR, "orbus_icon.png")
 ICON_URL = "https://github.com/SuperYosh23/Orbus/blob/main/icon.png?raw=true"
 
-os.makedirs(INSTANCES_DIR, exist_ok=True)
-
-# -------------------------
-# Helper Function: Java Scanner
-# -------------------------
-def find_system_javas_enhanced(deep=False):
-    java_paths = set()
-    if os.environ.get("JAVA_HOME"):
-        java_paths.add(os.path.join(os.environ["JAVA_HOME"], "bin", "javaw.exe" if sys.platform == "win32" else "java"))
-
-    for candidate in ("javaw", "java", "java.exe", "javaw.exe"):
-        p = shutil.which(candidate)
-        if p: java_paths.add(os.path.abspath(p))
-
-    for pdir in os.environ.get("PATH", "").split(os.pathsep):
-        try:
-            if not os.path.isdir(pdir): continue
-            for fname in os.listdir(pdir):
-                if fname.lower().startswith("java") and os.access(os.path.join(pdir, fname), os.X_OK):
-                    java_paths.add(os.path.abspath(os.path.join(pdir, fname)))
-        except: pass
-
-    search_dirs = []
-    if sys.platform == "win32":
-        search_dirs = [r"C:\Program Files\Java", r"C:\Program Files (x86)\Java", r"C:\Program Files\Eclipse Adoptium", r"C:\Program Files\Microsoft", r"C:\Program Files\BellSoft", r"C:\Program Files\Azul Systems", r"C:\ProgramData\Oracle\Java", r"C:\Program Files\Amazon Corretto"]
-    elif sys.platform.startswith("linux"):
-        search_dirs = ["/usr/lib/jvm", "/opt", "/usr/java"]
-    elif sys.platform == "darwin":
-        search_dirs = ["/Library/Java/JavaVirtualMachines"]
-
-    for root_dir in search_dirs:
-        if os.path.exists(root_dir):
-            for dirpath, _, filenames in os.walk(root_dir):
-                if dirpath.count(os.sep) - root_dir.count(os.sep) > (4 if not deep else 8): continue
-                targets = ("javaw.exe", "java.exe") if sys.platform == "win32" else ("java",)
-                for t in targets:
-                    if t in filenames: java_paths.add(os.path.abspath(os.path.join(dirpath, t)))
-
-    normalized = set()
-    for p in java_paths:
-        try:
-            rp = os.path.realpath(p)
-            if os.path.exists(rp) and os.access(rp, os.X_OK): normalized.add(rp)
-        except: pass
-
-    def _probe_java(path):
-        try:
-            proc = subprocess.run([path, "-version"], capture_output=True, text=True, timeout=2)
-            output = (proc.stderr or "") + (proc.stdout or "")
-            if not re.search(r'(?i)\b(java version|openjdk|hotspot|graalvm|jre|jdk|java\(tm\)|java virtual machine|runtime environment)\b', output): return None
-            version_match = re.search(r'version "([^\"]+)"', output)
-            return {"path": path, "version": version_match.group(1) if version_match else "Unknown", "arch": "64-bit" if "64-bit" in output else "32-bit"}
-        except: return None
-
-    results = []
-    for p in sorted(normalized):
-        info = _probe_java(p)
-        if info: results.append(info)
-    return sorted(results, key=lambda x: x['version'], reverse=True)
-
 # -------------------------
 # Custom Scrollable Dropdown Widget
 # -------------------------
 class ScrollableComboBox(ctk.CTkFrame):
+    # Only VISIBLE_ROWS buttons ever exist; scrolling and filtering just relabel
+    # them, so the dropdown stays responsive with thousands of values.
+    VISIBLE_ROWS = 10
+    FILTER_DELAY_MS = 120
+    QUERY_CACHE_SIZE = 32
+
     def __init__(self, master, width=200, height=30, values=[], command=None, **kwargs):
         super().__init__(master, width=width, height=height, fg_color="transparent", **kwargs)
         self.command = command
-        self.values = values
         self.width = width
         self.is_open = False
+        self._set_values(values)
         self.selected_value = values[0] if values else ""
         self.main_button = ctk.CTkButton(self, text=self.selected_value, width=width, height=height, fg_color="gray20", hover_color="gray30", command=self.toggle_dropdown)
         self.main_button.pack(fill="both", expand=True)
         self.dropdown_window = None
+        self._filter_job = None
+
+    def _set_values(self, values):
+        self.values = list(values)
+        self._lower = [v.lower() for v in self.values]
+        self._query_cache = {}
+
+    def _match(self, query):
+        # Substring search over the precomputed lowercase list. Typing usually
+        # extends the last query, so narrow down from the longest cached prefix.
+        if not query: return range(len(self.values))
+        if query in self._query_cache: return self._query_cache[query]
+        base = range(len(self.values))
+        for k in range(len(query) - 1, 0, -1):
+            if query[:k] in self._query_cache:
+                base = self._query_cache[query[:k]]; break
+        lower = self._lower
+        res = [i for i in base if query in lower[i]]
+        if len(self._query_cache) >= self.QUERY_CACHE_SIZE: self._query_cache.pop(next(iter(self._query_cache)))
+        self._query_cache[query] = res
+        return res
 
     def toggle_dropdown(self):
         if self.is_open: self.close_dropdown()
@@ -123,9 +92,23 @@ class ScrollableComboBox(ctk.CTkFrame):
         self.search_entry = ctk.CTkEntry(self.dropdown_window, placeholder_text="Type to search...", textvariable=self.search_var)
         self.search_entry.pack(fill="x", padx=5, pady=5)
         self.search_entry.focus_set()
-        self.scroll_frame = ctk.CTkScrollableFrame(self.dropdown_window, width=self.width, height=250)
-        self.scroll_frame.pack(fill="both", expand=True)
-        self.populate_options(self.values)
+        body = ctk.CTkFrame(self.dropdown_window, fg_color="transparent")
+        body.pack(fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        rows_frame = ctk.CTkFrame(body, fg_color="transparent")
+        rows_frame.pack(side="left", fill="both", expand=True)
+        self.rows, self._row_text = [], []
+        for _ in range(self.VISIBLE_ROWS):
+            btn = ctk.CTkButton(rows_frame, text="", fg_color="transparent", text_color=("black", "white"), anchor="w", height=24)
+            btn.pack(fill="x", pady=1)
+            self.rows.append(btn); self._row_text.append(None)
+        self.empty_label = ctk.CTkLabel(rows_frame, text="No results found", text_color="gray")
+        # Bindings on the toplevel reach every child through its bindtags
+        self.dropdown_window.bind("<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1))
+        self.dropdown_window.bind("<Button-4>", lambda e: self._scroll_by(-1))
+        self.dropdown_window.bind("<Button-5>", lambda e: self._scroll_by(1))
+        self.populate_options(range(len(self.values)))
         self.dropdown_window.bind("<FocusOut>", self._on_focus_out)
 
     def _on_focus_out(self, event):
@@ -136,18 +119,46 @@ class ScrollableComboBox(ctk.CTkFrame):
             except: pass
             self.close_dropdown()
 
-    def populate_options(self, options):
-        for widget in self.scroll_frame.winfo_children(): widget.destroy()
-        if not options:
-            ctk.CTkLabel(self.scroll_frame, text="No results found", text_color="gray").pack(pady=5)
-        else:
-            for val in options:
-                btn = ctk.CTkButton(self.scroll_frame, text=val, fg_color="transparent", text_color=("black", "white"), anchor="w", height=24, command=lambda v=val: self.select_option(v))
-                btn.pack(fill="x", pady=1)
+    def populate_options(self, matches):
+        # matches: indices into self.values
+        self._matches = matches
+        self._top = 0
+        if matches: self.empty_label.pack_forget()
+        else: self.empty_label.pack(pady=5)
+        self._render()
+
+    def _render(self):
+        n = len(self._matches)
+        for i, row in enumerate(self.rows):
+            j = self._top + i
+            text = self.values[self._matches[j]] if j < n else ""
+            if text == self._row_text[i]: continue
+            self._row_text[i] = text
+            if text: row.configure(text=text, state="normal", command=lambda v=text: self.select_option(v))
+            else: row.configure(text="", state="disabled", command=None)
+        self.scrollbar.set(self._top / n if n else 0, min(1, (self._top + self.VISIBLE_ROWS) / n) if n else 1)
+
+    def _scroll_to(self, top):
+        top = max(0, min(int(top), len(self._matches) - self.VISIBLE_ROWS))
+        if top != self._top:
+            self._top = top
+            self._render()
+
+    def _scroll_by(self, rows):
+        if self.dropdown_window: self._scroll_to(self._top + rows * 3)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto": self._scroll_to(float(value) * len(self._matches))
+        else: self._scroll_by(int(value))
 
     def filter_options(self, *args):
-        search_text = self.search_var.get().lower()
-        self.populate_options([v for v in self.values if search_text in v.lower()])
+        # Debounced so a burst of keystrokes only filters once
+        if self._filter_job: self.after_cancel(self._filter_job)
+        self._filter_job = self.after(self.FILTER_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        if self.dropdown_window: self.populate_options(self._match(self.search_var.get().lower()))
 
     def select_option(self, value):
         self.selected_value = value
@@ -156,6 +167,9 @@ class ScrollableComboBox(ctk.CTkFrame):
         if self.command: self.command(value)
 
     def close_dropdown(self):
+        if self._filter_job:
+            self.after_cancel(self._filter_job)
+            self._filter_job = None
         if self.dropdown_window:
             self.dropdown_window.destroy()
             self.dropdown_window = None
@@ -167,25 +181,250 @@ class ScrollableComboBox(ctk.CTkFrame):
         self.main_button.configure(text=value)
     def configure(self, values=None):
         if values is not None:
-            self.values = values
+            self._set_values(values)
             if self.selected_value not in values and values:
                 self.selected_value = values[0]
                 self.main_button.configure(text=self.selected_value)
+            if self.dropdown_window: self._apply_filter()
 
 # -------------------------
 # Main App
 # -------------------------
 class LogWindow(ctk.CTkToplevel):
-    def __init__(self, master):
+    # Drains a LogRing once per tick: one batched insert, trim to max_lines,
+    # and only follow the output if the view was already at the bottom.
+    def __init__(self, master, ring=None, max_lines=5000, tick_ms=50):
         super().__init__(master)
         self.title("Minecraft Console Logs")
         self.geometry("900x500")
+        self.ring = ring or LogRing()
+        self.max_lines = max_lines
+        self.tick_ms = tick_ms
         self.textbox = ctk.CTkTextbox(self, font=("Consolas", 12))
         self.textbox.pack(fill="both", expand=True, padx=10, pady=10)
+        self.after(self.tick_ms, self.flush)
 
     def log(self, text):
-        self.textbox.insert("end", text)
-        self.textbox.see("end")
+        self.ring.push(text)
+
+    def flush(self):
+        if not self.winfo_exists(): return
+        lines, dropped = self.ring.drain()
+        if lines or dropped:
+            pinned = self.textbox.yview()[1] >= 0.999
+            if dropped: lines.insert(0, f"[... {dropped} lines dropped ...]\n")
+            self.textbox.insert("end", "".join(lines))
+            excess = int(self.textbox.index("end-1c").split(".")[0]) - self.max_lines
+            if excess > 0: self.textbox.delete("1.0", f"{excess + 1}.0")
+            if pinned: self.textbox.see("end")
+        self.after(self.tick_ms, self.flush)
+
+class LogBrowser(LogWindow):
+    # Search captured sessions of one instance. Matches stream into the ring
+    # from a worker thread, so huge logs never load into memory at once.
+    MAX_RESULTS = 20000
+
+    def __init__(self, master, instance_name, logs_dir, scheduler):
+        super().__init__(master, max_lines=self.MAX_RESULTS)
+        self.title(f"Past Logs - {instance_name}")
+        self.logs_dir = logs_dir
+        self.scheduler = scheduler
+        self.search_gen = 0
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", padx=10, pady=(10, 0), before=self.textbox)
+        self.sessions = list_sessions(logs_dir)
+        self.session_combo = ctk.CTkComboBox(bar, values=self.sessions or ["No sessions"], width=220, command=lambda _: self.run_search())
+        self.session_combo.pack(side="left", padx=(0, 10))
+        self.level_combo = ctk.CTkComboBox(bar, values=["All", "WARN", "ERROR", "FATAL"], width=90, command=lambda _: self.run_search())
+        self.level_combo.pack(side="left", padx=(0, 10))
+        self.query_entry = ctk.CTkEntry(bar, placeholder_text="Regex filter...")
+        self.query_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        self.query_entry.bind("<Return>", lambda e: self.run_search())
+        ctk.CTkButton(bar, text="Search", width=80, command=self.run_search).pack(side="right")
+        self.summary = ctk.CTkLabel(self, text="", text_color="gray")
+        self.summary.pack(side="bottom", pady=(0, 5))
+        self.run_search()
+
+    def run_search(self):
+        if not self.sessions: return
+        self.search_gen += 1
+        gen, session = self.search_gen, self.session_combo.get()
+        level = None if self.level_combo.get() == "All" else self.level_combo.get()
+        query = self.query_entry.get().strip() or None
+        self.ring.drain()
+        self.textbox.delete("1.0", "end")
+        def run(task):
+            try:
+                log = SessionLog(os.path.join(self.logs_dir, session))
+                found = 0
+                for n, line in log.iter_lines(level=level, pattern=query):
+                    if gen != self.search_gen or task.cancelled: return
+                    self.ring.push(f"{n + 1:>7}  {line}")
+                    found += 1
+                    if found >= self.MAX_RESULTS: break
+                txt = f"{found} matching lines of {log.line_count()} ({log.count('WARN')} warnings, {log.count('ERROR')} errors)"
+            except Exception as e: txt = f"Search failed: {e}"
+            if gen == self.search_gen: self.after(0, lambda: self.summary.configure(text=txt))
+        self.scheduler.submit(run, name="Search logs", kind="disk", silent=True)
+
+class TaskPanel(ctk.CTkFrame):
+    # One row per running task, fed by the scheduler's event stream.
+    def __init__(self, master, scheduler, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.rows = {}
+        scheduler.subscribe(lambda task, event: self.after(0, lambda: self.update_task(task, event)))
+
+    def update_task(self, task, event):
+        row = self.rows.get(task.id)
+        if row is None:
+            if task.done(): return
+            fr = ctk.CTkFrame(self)
+            fr.pack(fill="x", pady=2)
+            lbl = ctk.CTkLabel(fr, text="", anchor="w")
+            lbl.pack(side="left", padx=10, fill="x", expand=True)
+            btn = ctk.CTkButton(fr, text="✕", width=28, fg_color="gray30", command=task.cancel)
+            btn.pack(side="right", padx=5)
+            bar = ctk.CTkProgressBar(fr, width=160)
+            bar.pack(side="right", padx=10)
+            row = self.rows[task.id] = {"frame": fr, "label": lbl, "bar": bar, "button": btn, "mode": None}
+        text = task.name + (f" - {task.message}" if task.message else "")
+        if task.done():
+            row["bar"].stop(); row["bar"].configure(mode="determinate"); row["bar"].set(1 if task.state == "done" else 0)
+            row["button"].pack_forget()
+            text = f"{task.name} - " + {"done": "done", "cancelled": "cancelled"}.get(task.state, f"failed: {task.error}")
+            self.after(4000 if task.state == "done" else 10000, lambda: self.remove_task(task.id))
+        else:
+            mode = "indeterminate" if task.progress is None else "determinate"
+            if mode != row["mode"]:
+                row["mode"] = mode
+                row["bar"].stop()
+                row["bar"].configure(mode=mode)
+                if mode == "indeterminate": row["bar"].start()
+            if task.progress is not None: row["bar"].set(task.progress)
+        row["label"].configure(text=text)
+
+    def remove_task(self, task_id):
+        row = self.rows.pop(task_id, None)
+        if row: row["frame"].destroy()
+
+class TelemetryWindow(ctk.CTkToplevel):
+    # Line charts over a session's telemetry ring, redrawn once per sample.
+    CHARTS = (("cpu_percent", "CPU %", "#3B8ED0"), ("rss_mb", "Memory (MB)", "#2FA572"), ("threads", "Threads", "#D6A840"),
+              ("read_mb_s", "Disk read (MB/s)", "#9B59B6"), ("write_mb_s", "Disk write (MB/s)", "#E06C5A"))
+
+    def __init__(self, master, session, points=300):
+        super().__init__(master)
+        self.title(f"Telemetry - {session.instance} (pid {session.pid})")
+        self.geometry("700x620")
+        self.session = session
+        self.sampler = session.telemetry
+        self.points = points
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", padx=10, pady=(10, 0))
+        self.summary = ctk.CTkLabel(bar, text="", anchor="w")
+        self.summary.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(bar, text="Export CSV", width=100, command=self.export_csv).pack(side="right")
+        self.interval_combo = ctk.CTkComboBox(bar, values=["0.5", "1", "2", "5"], width=70, command=self.set_interval)
+        self.interval_combo.set(f"{self.sampler.interval:g}")
+        self.interval_combo.pack(side="right", padx=10)
+        ctk.CTkLabel(bar, text="Interval (s)").pack(side="right")
+        self.canvas = ctk.CTkCanvas(self, bg="#1d1e1e", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True, padx=10, pady=10)
+        self.canvas.bind("<Configure>", lambda e: self.draw())
+        self.after(0, self.tick)
+
+    def set_interval(self, value):
+        try: self.sampler.interval = max(0.1, float(value))
+        except ValueError: pass
+
+    def tick(self):
+        if not self.winfo_exists(): return
+        self.draw()
+        if self.session.running: self.after(int(self.sampler.interval * 1000), self.tick)
+
+    def draw(self):
+        c = self.canvas
+        c.delete("all")
+        w, h = c.winfo_width(), c.winfo_height()
+        ring = self.sampler.ring
+        state = "running" if self.session.running else f"exited with code {self.session.exit_code}"
+        self.summary.configure(text=f"{state} - {ring.count} samples")
+        if w <= 1 or h <= 1: return
+        ch = h / len(self.CHARTS)
+        step = w / (self.points - 1)
+        for i, (field, label, color) in enumerate(self.CHARTS):
+            vals = ring.column(field)[-self.points:]
+            top, bottom = i * ch + 20, (i + 1) * ch - 6
+            peak = max(vals, default=0)
+            c.create_text(8, i * ch + 4, anchor="nw", fill="gray70", text=f"{label}: {vals[-1]:.1f}  (max {peak:.1f})" if vals else label)
+            c.create_line(0, bottom, w, bottom, fill="gray25")
+            if len(vals) > 1:
+                x0, scale = w - step * (len(vals) - 1), (bottom - top) / (peak or 1)
+                pts = []
+                for j, v in enumerate(vals): pts += [x0 + j * step, bottom - v * scale]
+                c.create_line(*pts, fill=color, width=2)
+
+    def export_csv(self):
+        s = self.session
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".csv", filetypes=[("CSV", "*.csv")],
+                                            initialfile=f"{s.instance}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(s.started))}-telemetry.csv")
+        if not path: return
+        try: self.sampler.ring.write_csv(path)
+        except OSError as e: messagebox.showerror("Export Error", str(e), parent=self)
+
+class LaunchTimesWindow(ctk.CTkToplevel):
+    # Last / p50 / p95 per launch phase over an instance's recent launches.
+    def __init__(self, master, name, records, summary, last):
+        super().__init__(master)
+        self.title(f"Launch Times - {name}")
+        self.geometry("520x420")
+        ctk.CTkLabel(self, text=f"Last {min(len(records), last)} of {len(records)} launches" if records else "No launches recorded yet",
+                     text_color="gray").pack(pady=(15, 5))
+        table = ctk.CTkFrame(self)
+        table.pack(fill="both", expand=True, padx=20, pady=(5, 20))
+        table.grid_columnconfigure(0, weight=1)
+        for col, head in enumerate(("Phase", "Last", "p50", "p95")):
+            ctk.CTkLabel(table, text=head, font=ctk.CTkFont(weight="bold"), anchor="w" if col == 0 else "e").grid(row=0, column=col, sticky="ew", padx=10, pady=(8, 4))
+        for row, (key, s) in enumerate(summary.items(), start=1):
+            ctk.CTkLabel(table, text=PHASE_LABELS[key], anchor="w").grid(row=row, column=0, sticky="ew", padx=10)
+            for col, k in enumerate(("last", "p50", "p95"), start=1):
+                ctk.CTkLabel(table, text=f"{s[k]:.2f}s", anchor="e").grid(row=row, column=col, sticky="ew", padx=10)
+
+class SessionPanel(ctk.CTkFrame):
+    # One row per game session. Starts and exits arrive from the session
+    # manager's threads; nothing here polls the processes.
+    def __init__(self, master, manager, open_logs, open_stats, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.manager = manager
+        self.open_logs = open_logs
+        self.open_stats = open_stats
+        self.rows = {}
+        manager.subscribe(lambda session, event: self.after(0, lambda: self.update_session(session, event)))
+
+    def update_session(self, session, event):
+        row = self.rows.get(session.id)
+        if event == "removed":
+            if row: self.rows.pop(session.id)["frame"].destroy()
+            return
+        if row is None:
+            fr = ctk.CTkFrame(self)
+            fr.pack(fill="x", pady=2)
+            lbl = ctk.CTkLabel(fr, text="", anchor="w")
+            lbl.pack(side="left", padx=10, fill="x", expand=True)
+            btn = ctk.CTkButton(fr, text="Stop", width=70, fg_color="gray30", command=session.stop)
+            btn.pack(side="right", padx=5)
+            ctk.CTkButton(fr, text="Logs", width=70, fg_color="gray30", command=lambda: self.open_logs(session)).pack(side="right", padx=5)
+            if session.telemetry: ctk.CTkButton(fr, text="Stats", width=70, fg_color="gray30", command=lambda: self.open_stats(session)).pack(side="right", padx=5)
+            row = self.rows[session.id] = {"frame": fr, "label": lbl, "button": btn}
+        started = time.strftime("%H:%M:%S", time.localtime(session.started))
+        if session.running:
+            text = f"▶ {session.instance} - pid {session.pid} - since {started}"
+            if session.timer and "ready" in session.timer.marks: text += f" - ready in {session.timer.marks['ready']:.1f}s"
+        else:
+            mins, secs = divmod(int(session.uptime()), 60)
+            text = f"■ {session.instance} - pid {session.pid} - exited with code {session.exit_code} after {mins // 60}:{mins % 60:02d}:{secs:02d}"
+            row["button"].configure(text="Dismiss", command=lambda: self.manager.remove(session.id))
+        row["label"].configure(text=text)
 
 class OrbusLauncher(ctk.CTk):
     def __init__(self):
@@ -193,15 +432,30 @@ class OrbusLauncher(ctk.CTk):
         self.title("Orbus Launcher")
         self.geometry("1000x850")
 
-        self.instances = self.load_config()
+        self.core = Orbus()
+        self.instances = self.core.instances
+        self.instances.set_scheduler(self.after, self.after_cancel)
         self.current_instance_name = None
-        self.progress_win = None
+        self.tasks = self.core.tasks
+        self.sessions = self.core.sessions
+        self.session_windows = {}
+        self.sessions.subscribe(lambda session, event: event == "ready" and self.after(0, lambda: self.show_ready(session)))
         self.tk_icon = None
         self.context_menu_ref = None # Reference to active context menu
+        self.downloader = self.core.downloader
+        self.store = self.core.store
+        self.meta = self.core.meta
+        self.icons = IconService(ICON_CACHE_DIR)
+        self.modrinth = ModrinthSearch(self.downloader.session)
+        self.search_page = None
+        self.search_job = None
 
         # Drag and Drop variables
         self.drag_data = {"widget": None, "index": None, "start_y": 0}
         self.instance_widgets = []
+        self.instance_buttons = {}
+        self._button_state = {}
+        self._thumb_cache = {}
 
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -267,30 +521,57 @@ class OrbusLauncher(ctk.CTk):
         self.java_browse_btn.pack(side="right")
 
         ctk.CTkLabel(self.settings_frame, text="RAM Allocation (GB)").pack(anchor="w", padx=20, pady=(10, 0))
-        self.ram_label = ctk.CTkLabel(self.settings_frame, text="4 GB", font=ctk.CTkFont(weight="bold"))
-        self.ram_label.pack(anchor="w", padx=20)
-        self.ram_slider = ctk.CTkSlider(self.settings_frame, from_=2, to=12, number_of_steps=10, command=self.update_ram_label)
+        self.ram_frame = ctk.CTkFrame(self.settings_frame, fg_color="transparent")
+        self.ram_frame.pack(fill="x", padx=20)
+        self.ram_label = ctk.CTkLabel(self.ram_frame, text="4 GB", font=ctk.CTkFont(weight="bold"))
+        self.ram_label.pack(side="left")
+        self.ram_auto_var = ctk.BooleanVar(value=False)
+        self.ram_auto_chk = ctk.CTkCheckBox(self.ram_frame, text="Auto (from system memory and mods)", variable=self.ram_auto_var, command=self.toggle_ram_auto)
+        self.ram_auto_chk.pack(side="right")
+        # Scale to the machine instead of a fixed 12 GB
+        mem = host_memory()
+        ram_max = max(12, (mem[0] - OS_RESERVE_MB) // 1024) if mem else 12
+        self.ram_slider = ctk.CTkSlider(self.settings_frame, from_=2, to=ram_max, number_of_steps=ram_max - 2, command=self.update_ram_label)
         self.ram_slider.pack(fill="x", padx=20, pady=(5, 15))
         self.ram_slider.set(4)
 
+        ctk.CTkLabel(self.settings_frame, text="JVM Profile").pack(anchor="w", padx=20)
+        self.profile_combo = ctk.CTkComboBox(self.settings_frame, values=list(PROFILES.values()), state="readonly")
+        self.profile_combo.pack(fill="x", padx=20, pady=(5, 10))
+        self.profile_combo.set(PROFILES[DEFAULT_PROFILE])
+
         self.show_logs_var = ctk.BooleanVar(value=False)
         self.logs_chk = ctk.CTkCheckBox(self.settings_frame, text="Show Console Logs", variable=self.show_logs_var)
         self.logs_chk.pack(anchor="w", padx=20, pady=(10, 5))
+        self.force_verify_var = ctk.BooleanVar(value=False)
+        self.verify_chk = ctk.CTkCheckBox(self.settings_frame, text="Force Verify Game Files", variable=self.force_verify_var)
+        self.verify_chk.pack(anchor="w", padx=20, pady=(5, 5))
+        self.appcds_var = ctk.BooleanVar(value=False)
+        self.appcds_chk = ctk.CTkCheckBox(self.settings_frame, text="Class Data Sharing (faster startup after first launch)", variable=self.appcds_var)
+        self.appcds_chk.pack(anchor="w", padx=20, pady=(5, 5))
 
         self.folder_btn = ctk.CTkButton(self.settings_frame, text="📂 Open Instance Folder", command=self.open_instance_folder, fg_color="gray30")
         self.folder_btn.pack(fill="x", padx=20, pady=(10, 5))
         self.mods_btn = ctk.CTkButton(self.settings_frame, text="🧩 Open Mods Folder", command=self.open_mods_folder, fg_color="gray30")
-        self.mods_btn.pack(fill="x", padx=20, pady=(0, 20))
+        self.mods_btn.pack(fill="x", padx=20, pady=(0, 5))
+        self.times_btn = ctk.CTkButton(self.settings_frame, text="⏱ Launch Times", command=self.open_launch_times, fg_color="gray30")
+        self.times_btn.pack(fill="x", padx=20, pady=(0, 5))
+        self.past_logs_btn = ctk.CTkButton(self.settings_frame, text="📜 Browse Past Logs", command=self.open_log_browser, fg_color="gray30")
+        self.past_logs_btn.pack(fill="x", padx=20, pady=(0, 20))
 
         self.status_label = ctk.CTkLabel(self.main_frame, text="Ready", text_color="gray")
         self.status_label.pack(side="bottom", pady=5)
         self.launch_btn = ctk.CTkButton(self.main_frame, text="LAUNCH GAME", height=55, font=ctk.CTkFont(size=20, weight="bold"), command=self.start_launch_thread)
         self.launch_btn.pack(side="bottom", fill="x", padx=20, pady=10)
+        self.task_panel = TaskPanel(self.main_frame, self.tasks)
+        self.task_panel.pack(side="bottom", fill="x", padx=20, after=self.launch_btn)
+        self.session_panel = SessionPanel(self.main_frame, self.sessions, self.open_session_logs, self.open_session_stats)
+        self.session_panel.pack(side="bottom", fill="x", padx=20, after=self.task_panel)
 
         self.refresh_instance_buttons()
-        threading.Thread(target=self.download_icon_bg, daemon=True).start()
-        threading.Thread(target=self.load_versions_bg, daemon=True).start()
-        threading.Thread(target=self.load_fabric_versions_bg, daemon=True).start()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        for job in (self.download_icon_bg, self.load_versions_bg, self.load_fabric_versions_bg):
+            self.tasks.submit(job, priority=PRIORITY_BACKGROUND, silent=True)
 
     # --- Icon Handling ---
     def setup_icon(self):
@@ -303,7 +584,7 @@ class OrbusLauncher(ctk.CTk):
                 self.reload_sidebar_logo()
             except: pass
 
-    def download_icon_bg(self):
+    def download_icon_bg(self, task=None):
         if not os.path.exists(ICON_PATH):
             try:
                 r = requests.get(ICON_URL, timeout=10)
@@ -327,14 +608,11 @@ class OrbusLauncher(ctk.CTk):
             self.java_entry.insert(0, filename)
 
     def update_ram_label(self, val):
-        self.ram_label.configure(text=f"{int(val)} GB")
+        self.ram_label.configure(text="Auto" if self.ram_auto_var.get() else f"{int(val)} GB")
 
-    def load_config(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f: return json.load(f)
-            except: return {}
-        return {}
+    def toggle_ram_auto(self):
+        self.ram_slider.configure(state="disabled" if self.ram_auto_var.get() else "normal")
+        self.update_ram_label(self.ram_slider.get())
 
     def save_config(self):
         if self.current_instance_name and self.current_instance_name in self.instances:
@@ -343,23 +621,40 @@ class OrbusLauncher(ctk.CTk):
                 "version": self.version_combo.get(),
                 "loader": self.loader_combo.get(),
                 "loader_version": self.loader_ver_combo.get(),
-                "ram": int(self.ram_slider.get()),
-                "java_path": self.java_entry.get()
+                "ram": "auto" if self.ram_auto_var.get() else int(self.ram_slider.get()),
+                "java_path": self.java_entry.get(),
+                "appcds": self.appcds_var.get(),
+                "jvm_profile": next((k for k, v in PROFILES.items() if v == self.profile_combo.get()), DEFAULT_PROFILE)
             })
-        with open(CONFIG_FILE, 'w') as f: json.dump(self.instances, f, indent=4)
+        self.instances.save()
+
+    def on_close(self):
+        running = self.sessions.running()
+        if running and not messagebox.askyesno("Games Running", f"{len(running)} game(s) still running. They will keep running, but Orbus stops capturing their logs. Close anyway?"): return
+        self.save_config()
+        self.instances.flush()
+        self.destroy()
 
-    def load_versions_bg(self):
+    def load_versions_bg(self, task=None):
+        # Fill from the disk cache first, then revalidate in the background.
         try:
-            versions = minecraft_launcher_lib.utils.get_version_list()
-            rel = [v["id"] for v in versions if v["type"] == "release"]
+            cached = self.meta.peek(MOJANG_MANIFEST_URL)
+            if cached: self.after(0, lambda rel=release_ids(cached): self.version_combo.configure(values=rel))
+            if cached and self.meta.is_fresh(MOJANG_MANIFEST_URL): return
+            rel = release_ids(self.meta.get_json(MOJANG_MANIFEST_URL))
             self.after(0, lambda: self.version_combo.configure(values=rel))
         except: pass
 
-    def load_fabric_versions_bg(self):
+    def load_fabric_versions_bg(self, task=None):
         try:
-            data = requests.get("https://meta.fabricmc.net/v2/versions/loader").json()
-            versions = ["latest"] + [v["version"] for v in data]
-            self.after(0, lambda: self.loader_ver_combo.configure(values=versions))
+            cached = self.meta.peek(FABRIC_LOADERS_URL)
+            if cached: self.after(0, lambda vs=["latest"] + loader_ids(cached): self.loader_ver_combo.configure(values=vs))
+            if not (cached and self.meta.is_fresh(FABRIC_LOADERS_URL)):
+                versions = ["latest"] + loader_ids(self.meta.get_json(FABRIC_LOADERS_URL))
+                self.after(0, lambda: self.loader_ver_combo.configure(values=versions))
+        except: pass
+        # Quilt has no dropdown, but launch() resolves its latest loader from here
+        try: self.meta.get_json(QUILT_LOADERS_URL)
         except: pass
 
     def toggle_loader_settings(self, choice):
@@ -372,42 +667,70 @@ class OrbusLauncher(ctk.CTk):
 
     # --- Instance Buttons with Icons & Context Menu ---
     def refresh_instance_buttons(self):
-        for w in self.scrollable_list.winfo_children(): w.destroy()
-        self.instance_widgets = []
+        # Diff against the buttons that already exist so only new, removed,
+        # moved or re-iconed instances touch any widgets.
         self.scrollable_list.grid_columnconfigure(0, weight=1)
-
-        keys = list(self.instances.keys())
-        for i, name in enumerate(keys):
-            icon_img = None
-            icon_path = self.instances[name].get("icon_path")
-            if icon_path and os.path.exists(icon_path):
-                try:
-                    pil_img = Image.open(icon_path)
-                    icon_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=(24, 24))
-                except: pass
-
-            btn = ctk.CTkButton(
-                self.scrollable_list, 
-                text=name, 
-                image=icon_img,
-                compound="left",
-                fg_color="transparent", 
-                border_width=1, 
-                anchor="w",
-                height=40,
-                command=lambda n=name: self.select_instance(n)
-            )
-            btn.grid(row=i, column=0, sticky="ew", pady=2)
-            
-            btn.bind("<Button-1>", lambda event, b=btn, idx=i: self.on_drag_start(event, b, idx))
-            btn.bind("<B1-Motion>", lambda event: self.on_drag_motion(event))
-            btn.bind("<ButtonRelease-1>", self.on_drag_end)
-
-            btn.bind("<Button-3>", lambda event, n=name: self.show_context_menu(event, n))
-            if sys.platform == "darwin": 
-                 btn.bind("<Button-2>", lambda event, n=name: self.show_context_menu(event, n))
-
-            self.instance_widgets.append(btn)
+        for name in [n for n in self.instance_buttons if n not in self.instances]:
+            self.instance_buttons.pop(name).destroy()
+            self._button_state.pop(name, None)
+
+        widgets = []
+        for i, name in enumerate(self.instances.keys()):
+            icon_key = self._icon_key(self.instances.field(name, "icon_path"))
+            btn = self.instance_buttons.get(name)
+            state = self._button_state.get(name)
+            if btn is not None and state["icon"] != icon_key:
+                # Recreate rather than reconfigure: ctk only attaches our
+                # bindings to an image label that existed at bind time.
+                btn.destroy(); btn = None
+            if btn is None:
+                btn = self._create_instance_button(name, icon_key)
+                self.instance_buttons[name] = btn
+                state = self._button_state[name] = {"icon": icon_key, "row": None}
+            if state["row"] != i:
+                btn.grid(row=i, column=0, sticky="ew", pady=2)
+                state["row"] = i
+            widgets.append(btn)
+        self.instance_widgets = widgets
+
+    def _create_instance_button(self, name, icon_key):
+        btn = ctk.CTkButton(
+            self.scrollable_list, 
+            text=name, 
+            image=self._instance_thumb(icon_key),
+            compound="left",
+            fg_color="transparent", 
+            border_width=1, 
+            anchor="w",
+            height=40,
+            command=lambda n=name: self.select_instance(n)
+        )
+        # Look the index up on press; buttons now outlive reorders
+        btn.bind("<Button-1>", lambda event, b=btn: self.on_drag_start(event, b, self.instance_widgets.index(b)))
+        btn.bind("<B1-Motion>", lambda event: self.on_drag_motion(event))
+        btn.bind("<ButtonRelease-1>", self.on_drag_end)
+
+        btn.bind("<Button-3>", lambda event, n=name: self.show_context_menu(event, n))
+        if sys.platform == "darwin": 
+             btn.bind("<Button-2>", lambda event, n=name: self.show_context_menu(event, n))
+        return btn
+
+    def _icon_key(self, icon_path):
+        if not icon_path: return None
+        try: return (icon_path, os.stat(icon_path).st_mtime_ns)
+        except OSError: return None
+
+    def _instance_thumb(self, icon_key):
+        # Decoded, pre-scaled 24x24 icons, keyed by path + mtime so an icon is
+        # only decoded again after the file itself changes.
+        if icon_key is None: return None
+        if icon_key not in self._thumb_cache:
+            for k in [k for k in self._thumb_cache if k[0] == icon_key[0]]: del self._thumb_cache[k]
+            try:
+                with Image.open(icon_key[0]) as img: thumb = img.convert("RGBA").resize((24, 24), Image.Resampling.LANCZOS)
+                self._thumb_cache[icon_key] = ctk.CTkImage(light_image=thumb, dark_image=thumb, size=(24, 24))
+            except: self._thumb_cache[icon_key] = None
+        return self._thumb_cache[icon_key]
 
     def show_context_menu(self, event, instance_name):
         # 1. Close any existing menu
@@ -418,6 +741,7 @@ class OrbusLauncher(ctk.CTk):
         # 2. Create new menu
         menu = Menu(self, tearoff=0)
         menu.add_command(label="Rename Instance", command=lambda: self.rename_instance(instance_name))
+        menu.add_command(label="Clone Instance", command=lambda: self.clone_instance(instance_name))
         menu.add_command(label="Change Instance Icon", command=lambda: self.change_instance_icon(instance_name))
         
         self.context_menu_ref = menu
@@ -487,11 +811,10 @@ class OrbusLauncher(ctk.CTk):
 
     def swap_widgets(self, i1, i2):
         self.instance_widgets[i1], self.instance_widgets[i2] = self.instance_widgets[i2], self.instance_widgets[i1]
-        self.instance_widgets[i1].grid(row=i1)
-        self.instance_widgets[i2].grid(row=i2)
-        w1, w2 = self.instance_widgets[i1], self.instance_widgets[i2]
-        w1.bind("<Button-1>", lambda e, b=w1, idx=i1: self.on_drag_start(e, b, idx))
-        w2.bind("<Button-1>", lambda e, b=w2, idx=i2: self.on_drag_start(e, b, idx))
+        for i in (i1, i2):
+            w = self.instance_widgets[i]
+            w.grid(row=i)
+            self._button_state[w.cget("text")]["row"] = i
 
     def on_drag_end(self, event):
         if not self.drag_data["widget"]: return
@@ -511,17 +834,25 @@ class OrbusLauncher(ctk.CTk):
         self.version_combo.set(d.get("version", "1.21.1"))
         self.loader_combo.set(d.get("loader", "Vanilla"))
         self.loader_ver_combo.set(d.get("loader_version", "latest"))
-        self.ram_slider.set(d.get("ram", 4))
-        self.update_ram_label(self.ram_slider.get())
+        ram = d.get("ram", 4)
+        self.ram_auto_var.set(ram == "auto")
+        if ram != "auto": self.ram_slider.set(ram)
+        self.toggle_ram_auto()
+        self.profile_combo.set(PROFILES.get(d.get("jvm_profile"), PROFILES[DEFAULT_PROFILE]))
         self.java_entry.delete(0, 'end')
         self.java_entry.insert(0, d.get("java_path", ""))
+        self.appcds_var.set(d.get("appcds", False))
         self.toggle_loader_settings(d.get("loader", "Vanilla"))
+        self.prefetch_instance(name)
+
+    def prefetch_instance(self, name, sticky=False):
+        self.core.prefetch(name, sticky=sticky)
 
     def add_instance(self):
         n = simpledialog.askstring("New", "Instance Name:")
         if n and n not in self.instances:
-            self.instances[n] = {"username": "", "version": "1.21.1", "loader": "Vanilla", "loader_version": "latest", "ram": 4, "java_path": "", "icon_path": ""}
-            self.save_config(); self.refresh_instance_buttons(); self.select_instance(n)
+            self.instances[n] = new_instance()
+            self.save_config(); self.refresh_instance_buttons(); self.prefetch_instance(n, sticky=True); self.select_instance(n)
 
     def delete_instance(self):
         if not self.current_instance_name: return
@@ -530,6 +861,7 @@ class OrbusLauncher(ctk.CTk):
             if name in self.instances: del self.instances[name]
             folder = os.path.join(INSTANCES_DIR, name)
             if os.path.exists(folder): shutil.rmtree(folder, ignore_errors=True)
+            self.tasks.submit(lambda task: self.store.release(name), name="Collect unused files", kind="disk", priority=PRIORITY_BACKGROUND, silent=True)
             self.current_instance_name = None
             self.save_config(); self.refresh_instance_buttons()
             self.header_label.configure(text="Select an Instance")
@@ -560,6 +892,7 @@ class OrbusLauncher(ctk.CTk):
                 shutil.move(old_folder, new_folder)
             
             self.instances[new_name] = self.instances.pop(target)
+            self.store.rename_owner(target, new_name)
             icon_path = self.instances[new_name].get("icon_path", "")
             if icon_path and target in icon_path:
                  self.instances[new_name]["icon_path"] = icon_path.replace(target, new_name)
@@ -576,12 +909,41 @@ class OrbusLauncher(ctk.CTk):
         except Exception as e:
             messagebox.showerror("Rename Error", str(e))
 
+    def clone_instance(self, target):
+        self.close_context_menu()
+        new_name = simpledialog.askstring("Clone Instance", f"Name for the copy of '{target}':", initialvalue=f"{target} (Copy)")
+        if not new_name: return
+        new_name = new_name.strip()
+        if not new_name or new_name in self.instances:
+            messagebox.showerror("Error", f"'{new_name}' already exists.")
+            return
+        src = os.path.join(INSTANCES_DIR, target)
+        dst = os.path.join(INSTANCES_DIR, new_name)
+        if os.path.exists(dst):
+            messagebox.showerror("Error", "Target folder already exists.")
+            return
+        self.save_config()
+        settings = dict(self.instances[target])
+
+        def run(task):
+            try:
+                if os.path.isdir(src): clone_tree(src, dst, skip=("orbus_logs", ".orbus"), cancel=task.cancel_event)
+                else: os.makedirs(dst)
+            except Exception as e:
+                shutil.rmtree(dst, ignore_errors=True)
+                if not task.cancelled: self.after(0, lambda m=str(e): messagebox.showerror("Clone Error", m))
+                raise
+            icon_path = settings.get("icon_path", "")
+            if icon_path and target in icon_path: settings["icon_path"] = icon_path.replace(target, new_name)
+            self.instances[new_name] = settings
+            self.store.copy_refs(target, new_name)
+            self.instances.save()
+            self.after(0, self.refresh_instance_buttons)
+        self.tasks.submit(run, name=f"Clone {target}", kind="disk")
+
     def _reorder_instances(self, new_order):
         try:
-            old = self.instances.copy()
-            new = {}
-            for n in new_order: new[n] = old[n]
-            self.instances = new
+            self.instances.reorder(new_order)
             if self.current_instance_name not in self.instances: self.current_instance_name = None
             self.save_config(); self.refresh_instance_buttons()
             if self.current_instance_name: self.select_instance(self.current_instance_name)
@@ -593,6 +955,15 @@ class OrbusLauncher(ctk.CTk):
             p = os.path.join(INSTANCES_DIR, self.current_instance_name, "mods")
             os.makedirs(p, exist_ok=True); self.open_path(p)
 
+    def open_log_browser(self):
+        if self.current_instance_name:
+            LogBrowser(self, self.current_instance_name, os.path.join(INSTANCES_DIR, self.current_instance_name, "orbus_logs"), self.tasks)
+
+    def open_launch_times(self, last=20):
+        if self.current_instance_name:
+            records, summary = self.core.launch_times(self.current_instance_name, last)
+            LaunchTimesWindow(self, self.current_instance_name, records, summary, last)
+
     def open_instance_folder(self):
         if self.current_instance_name:
             p = os.path.join(INSTANCES_DIR, self.current_instance_name); self.open_path(p)
@@ -603,6 +974,7 @@ class OrbusLauncher(ctk.CTk):
 
     # --- Modpack Logic ---
     def open_modrinth_search(self):
+        self.search_page, self.search_job = None, None
         self.search_win = ctk.CTkToplevel(self)
         self.search_win.title("Modrinth Browser")
         self.search_win.geometry("750x650")
@@ -611,31 +983,70 @@ class OrbusLauncher(ctk.CTk):
         self.search_entry = ctk.CTkEntry(container, placeholder_text="Search modpacks...")
         self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
         ctk.CTkButton(container, text="Search", command=self.perform_modrinth_search).pack(side="right")
+        self.search_entry.bind("<KeyRelease>", self.on_search_typed)
+        self.search_entry.bind("<Return>", lambda e: self.perform_modrinth_search())
         self.results_frame = ctk.CTkScrollableFrame(self.search_win, label_text="Results")
         self.results_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        # Infinite scroll: chain onto the results canvas's yscrollcommand, which
+        # Tk calls whenever the view moves or the content grows
+        canvas = self.results_frame.master
+        scrollbar_set = canvas.cget("yscrollcommand")
+        canvas.configure(yscrollcommand=lambda first, last: self.on_search_scrolled(scrollbar_set, first, last))
         self.perform_modrinth_search(True)
 
+    def on_search_typed(self, event=None):
+        # Debounce: only search once typing pauses
+        if event is not None and event.keysym == "Return": return
+        if self.search_job: self.search_win.after_cancel(self.search_job)
+        self.search_job = self.search_win.after(350, self.perform_modrinth_search)
+
     def perform_modrinth_search(self, is_rec=False):
+        if self.search_job:
+            self.search_win.after_cancel(self.search_job)
+            self.search_job = None
         q = self.search_entry.get() if not is_rec else ""
+        st = self.search_page
+        if st and not is_rec and q == st["query"] and (st["loading"] or st["total"] is not None): return
+        self.icons.cancel_all()
         for w in self.results_frame.winfo_children(): w.destroy()
-        def run():
-            try:
-                f = json.dumps([["project_type:modpack"], ["categories:fabric", "categories:quilt"]])
-                u = f"https://api.modrinth.com/v2/search?query={q}&facets={f}&limit=20"
-                d = requests.get(u, headers={"User-Agent": "Orbus/3.3"}).json()
-                for h in d.get("hits", []): self.after(0, lambda x=h: self.add_search_result(x))
-            except: pass
-        threading.Thread(target=run, daemon=True).start()
+        self.search_page = {"token": self.modrinth.new_token(), "query": q, "offset": 0, "total": None, "loading": False}
+        self.load_search_page()
+
+    def load_search_page(self):
+        st = self.search_page
+        st["loading"] = True
+        token, q, offset = st["token"], st["query"], st["offset"]
+        def run(task):
+            try: page = self.modrinth.search(q, offset)
+            except: page = None
+            self.after(0, lambda: self.show_search_page(token, page))
+        self.tasks.submit(run, name="Search Modrinth", silent=True)
+
+    def show_search_page(self, token, page):
+        # Responses from an older search are dropped here
+        if not self.modrinth.is_current(token) or not self.search_win.winfo_exists(): return
+        st = self.search_page
+        st["loading"] = False
+        if page is None: return
+        for h in page["hits"]: self.add_search_result(h)
+        st["offset"] = page["offset"] + len(page["hits"])
+        st["total"] = page["total_hits"] if page["hits"] else st["offset"]
+
+    def on_search_scrolled(self, scrollbar_set, first, last):
+        # Keeps the scrollbar in step, then fetches the next page once the view
+        # nears the bottom
+        if scrollbar_set: self.tk.call(scrollbar_set, first, last)
+        st = self.search_page
+        if st and not st["loading"] and st["total"] is not None and st["offset"] < st["total"] and float(last) >= 0.9:
+            self.load_search_page()
 
     def load_modpack_icon(self, url, label_widget):
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                image_data = io.BytesIO(response.content)
-                pil_image = Image.open(image_data)
+        def on_icon(pil_image):
+            def apply():
                 icon = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=(48, 48))
-                self.after(0, lambda: self.update_icon_label(label_widget, icon))
-        except: pass
+                self.update_icon_label(label_widget, icon)
+            self.after(0, apply)
+        self.icons.fetch(url, on_icon)
 
     def update_icon_label(self, label, icon):
         try:
@@ -648,134 +1059,81 @@ class OrbusLauncher(ctk.CTk):
         icon_label = ctk.CTkLabel(fr, text="📦", width=50, height=50, font=ctk.CTkFont(size=24))
         icon_label.pack(side="left", padx=10)
         ctk.CTkLabel(fr, text=f"{h['title']}\nby {h['author']}", anchor="w", justify="left").pack(side="left", padx=10, fill="x", expand=True)
-        ctk.CTkButton(fr, text="Install", width=80, command=lambda p=h['project_id']: self.install_from_modrinth(p)).pack(side="right", padx=10)
+        ctk.CTkButton(fr, text="Install", width=80, command=lambda p=h['project_id'], t=h['title']: self.install_from_modrinth(p, t)).pack(side="right", padx=10)
         if h.get("icon_url"):
-            threading.Thread(target=self.load_modpack_icon, args=(h["icon_url"], icon_label), daemon=True).start()
+            self.load_modpack_icon(h["icon_url"], icon_label)
 
-    def install_from_modrinth(self, pid):
-        def run():
+    def install_from_modrinth(self, pid, title=None):
+        def run(task):
             try:
-                self.after(0, lambda: self.show_progress_ui("Downloading..."))
-                v = requests.get(f"https://api.modrinth.com/v2/project/{pid}/version").json()
-                u = v[0]['files'][0]['url']
-                t = os.path.join(INSTANCES_DIR, "download.mrpack")
-                with open(t, "wb") as f: f.write(requests.get(u).content)
-                self.process_modpack(t)
-            except Exception as e: self.after(0, lambda: messagebox.showerror("Error", str(e)))
-        threading.Thread(target=run, daemon=True).start()
+                t = self.core.download_modrinth_pack(pid, task)
+                if self.process_modpack(t, task): os.remove(t)
+            except Exception as e:
+                if not task.cancelled: self.after(0, lambda m=str(e): messagebox.showerror("Error", m))
+                raise
+        self.tasks.submit(run, name=f"Install {title or pid}")
 
     def import_modpack(self):
         p = filedialog.askopenfilename(filetypes=[("Modpacks", "*.mrpack *.zip")])
-        if p: self.show_progress_ui("Importing..."); threading.Thread(target=self.process_modpack, args=(p,), daemon=True).start()
+        if p: self.tasks.submit(lambda task: self.process_modpack(p, task), name=f"Import {os.path.basename(p)}", kind="disk")
 
-    def process_modpack(self, path):
+    def process_modpack(self, path, task=None):
         try:
-            with zipfile.ZipFile(path, 'r') as z:
-                if "modrinth.index.json" in z.namelist(): self.install_mrpack(z)
-                else: self.install_basic_zip(z, path)
-            self.after(0, self.cleanup_installation)
-        except Exception as e: self.after(0, lambda: messagebox.showerror("Error", str(e)))
-
-    def cleanup_installation(self):
-        if self.progress_win: self.progress_win.destroy()
-        self.refresh_instance_buttons(); messagebox.showinfo("Success", "Done!")
-
-    def install_mrpack(self, z):
-        idx = json.loads(z.read("modrinth.index.json"))
-        n = idx.get("name", "Pack"); d = idx["dependencies"]
-        ldr = "Fabric" if "fabric-loader" in d else "Quilt" if "quilt-loader" in d else "Vanilla"
-        self.instances[n] = {"username": self.username_entry.get(), "version": d["minecraft"], "loader": ldr, "loader_version": "latest", "ram": 4, "java_path": "", "icon_path": ""}
-        self.save_config(); p = os.path.join(INSTANCES_DIR, n); os.makedirs(p, exist_ok=True)
-        fs = idx.get("files", [])
-        for i, f_o in enumerate(fs):
-            self.after(0, lambda v=(i+1)/len(fs): self.prog_bar.set(v))
-            dst = os.path.join(p, f_o["path"]); os.makedirs(os.path.dirname(dst), exist_ok=True)
-            with open(dst, "wb") as f: f.write(requests.get(f_o["downloads"][0]).content)
-        for file in z.namelist():
-            if file.startswith("overrides/"):
-                rel_path = file.replace("overrides/", "")
-                if rel_path:
-                    dest = os.path.join(p, rel_path)
-                    if file.endswith("/"): os.makedirs(dest, exist_ok=True)
-                    else:
-                        os.makedirs(os.path.dirname(dest), exist_ok=True)
-                        with open(dest, "wb") as f: f.write(z.read(file))
-
-    def install_basic_zip(self, z, p_orig):
-        n = os.path.splitext(os.path.basename(p_orig))[0]
-        self.instances[n] = {"username": "", "version": "1.21.1", "loader": "Vanilla", "loader_version": "latest", "ram": 4, "java_path": "", "icon_path": ""}
-        self.save_config(); p = os.path.join(INSTANCES_DIR, n); os.makedirs(p, exist_ok=True)
-        z.extractall(p)
-
-    def show_progress_ui(self, txt):
-        if self.progress_win: self.progress_win.destroy()
-        self.progress_win = ctk.CTkToplevel(self); self.progress_win.geometry("400x150")
-        ctk.CTkLabel(self.progress_win, text=txt).pack(pady=20)
-        self.prog_bar = ctk.CTkProgressBar(self.progress_win, width=300); self.prog_bar.pack(); self.prog_bar.set(0)
+            self.core.import_pack(path, username=self.username_entry.get(), task=task)
+            self.after(0, self.refresh_instance_buttons)
+            return True
+        except Exception as e:
+            if task and task.cancelled: raise
+            self.after(0, lambda m=str(e): messagebox.showerror("Error", m))
+            if task: raise
+            return False
 
     def start_launch_thread(self):
         if self.current_instance_name:
             self.save_config()
-            self.launch_btn.configure(state="disabled", text="Launching...")
-            threading.Thread(target=self.launch, daemon=True).start()
+            name = self.current_instance_name
+            self.tasks.submit(self.launch, name, name=f"Launch {name}", priority=PRIORITY_LAUNCH)
         else: messagebox.showwarning("Warning", "Select an instance.")
 
-    def launch(self):
+    def launch(self, task, target):
         try:
-            target = self.current_instance_name
-            d = self.instances[target].copy()
-            v, loader, user = d.get("version"), d.get("loader", "Vanilla"), d.get("username")
-            l_ver, ram = d.get("loader_version", "latest"), d.get("ram", 4)
-            custom_java = d.get("java_path", "").strip()
-            if not v or not user: raise Exception("Version or Username missing.")
-            inst_dir = os.path.abspath(os.path.join(INSTANCES_DIR, target))
-            os.makedirs(inst_dir, exist_ok=True)
-            def set_st(t): self.after(0, lambda: self.status_label.configure(text=t))
+            def set_st(t):
+                task.report(message=t)
+                self.after(0, lambda: self.status_label.configure(text=t))
             set_st(f"Preparing {target}...")
-            minecraft_launcher_lib.install.install_minecraft_version(v, MINECRAFT_DIR, callback={'setStatus': set_st})
-            l_id = str(v)
-            if loader == "Fabric":
-                actual_loader = l_ver
-                if l_ver == "latest":
-                    fabric_meta = requests.get("https://meta.fabricmc.net/v2/versions/loader").json()
-                    actual_loader = fabric_meta[0]["version"]
-                minecraft_launcher_lib.fabric.install_fabric(v, MINECRAFT_DIR, loader_version=actual_loader)
-                l_id = f"fabric-loader-{actual_loader}-{v}"
-            elif loader == "Quilt":
-                minecraft_launcher_lib.quilt.install_quilt(v, MINECRAFT_DIR)
-                l_id = f"quilt-loader-{v}"
-            set_st("Launching...")
-            if custom_java and os.path.exists(custom_java): java = custom_java
-            else: java = shutil.which("javaw") or shutil.which("java") or "java"
-            jvm_args = [f"-Xmx{ram}G", f"-Xms{ram}G", "-XX:+UseG1GC"]
-            opts = {"username": user, "uuid": "0", "token": "0", "gameDir": inst_dir, "executablePath": java, "jvmArguments": jvm_args}
-            cmd = minecraft_launcher_lib.command.get_minecraft_command(l_id, MINECRAFT_DIR, opts)
-            if "--gameDir" not in cmd: cmd.extend(["--gameDir", inst_dir])
-            else:
-                for i, arg in enumerate(cmd):
-                    if arg == "--gameDir": cmd[i+1] = inst_dir
-            process = subprocess.Popen(cmd, cwd=inst_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
-            log_win = None
-            if self.show_logs_var.get():
-                log_win = LogWindow(self)
-            self.withdraw()
-            def stream_reader():
-                for line in iter(process.stdout.readline, ""):
-                    if log_win and log_win.winfo_exists():
-                        self.after(0, lambda l=line: log_win.log(l))
-                process.stdout.close()
-            threading.Thread(target=stream_reader, daemon=True).start()
-            def check_alive():
-                if process.poll() is None: self.after(1000, check_alive)
-                else:
-                    if log_win and log_win.winfo_exists(): log_win.destroy()
-                    self.after(0, self.deiconify)
-                    self.after(0, lambda: self.launch_btn.configure(state="normal", text="LAUNCH GAME"))
-                    self.after(0, lambda: self.status_label.configure(text="Ready"))
-            check_alive()
+            force = self.force_verify_var.get()
+            timer = LaunchTimer()
+            cmd, inst_dir, installed = self.core.launch_command(target, callback={'setStatus': set_st}, force=force, timer=timer)
+            if installed and force: self.after(0, lambda: self.force_verify_var.set(False))
+            # The reader never touches Tk; a log window drains the session's ring on its own tick
+            session = self.sessions.start(target, cmd, inst_dir, timer=timer)
+            if self.show_logs_var.get(): self.after(0, lambda: self.open_session_logs(session))
+            self.after(0, lambda: self.status_label.configure(text="Ready"))
         except Exception as e:
-            self.after(0, lambda: messagebox.showerror("Launch Error", str(e)))
-            self.after(0, lambda: self.launch_btn.configure(state="normal", text="LAUNCH GAME"))
+            self.after(0, lambda m=str(e): messagebox.showerror("Launch Error", m))
+            self.after(0, lambda: self.status_label.configure(text="Ready"))
+            raise
+
+    def show_ready(self, session):
+        _, summary = self.core.launch_times(session.instance)
+        ready = summary.get("ready")
+        text = f"{session.instance} ready in {session.timer.marks['ready']:.1f}s"
+        if ready and ready["n"] > 1: text += f" (p50 {ready['p50']:.1f}s, p95 {ready['p95']:.1f}s over {ready['n']} launches)"
+        self.status_label.configure(text=text)
+
+    def open_session_logs(self, session):
+        win = self.session_windows.get(session.id)
+        if win is not None and win.winfo_exists():
+            win.focus(); return
+        win = self.session_windows[session.id] = LogWindow(self, session.ring)
+        win.title(f"Console - {session.instance} (pid {session.pid})")
+
+    def open_session_stats(self, session):
+        key = ("stats", session.id)
+        win = self.session_windows.get(key)
+        if win is not None and win.winfo_exists():
+            win.focus(); return
+        self.session_windows[key] = TelemetryWindow(self, session)
 
     # --- Java Auto Detect ---
     def open_java_detector(self):
@@ -790,31 +1148,36 @@ class OrbusLauncher(ctk.CTk):
         self.detect_progress.set(0)
         self.detect_progress.start()
         self.detect_scroll = ctk.CTkScrollableFrame(self.detect_win, label_text="Found Installations")
-        self.deep_scan_btn = ctk.CTkButton(self.detect_win, text="Deep Scan (may take longer)", fg_color="#3B8ED0", command=lambda: threading.Thread(target=self.run_java_scan_thread, kwargs={'deep': True}, daemon=True).start())
+        self.deep_scan_btn = ctk.CTkButton(self.detect_win, text="Deep Scan (may take longer)", fg_color="#3B8ED0", command=lambda: self.tasks.submit(self.run_java_scan_thread, name="Deep Java scan", kind="disk", deep=True))
         self.deep_scan_btn.pack(pady=8)
-        threading.Thread(target=self.run_java_scan_thread, kwargs={'deep': False}, daemon=True).start()
+        cached = self.core.cached_javas()
+        if cached: self.display_java_results(cached, refreshing=True)
+        self.tasks.submit(self.run_java_scan_thread, name="Java scan", kind="disk", deep=False, quiet=bool(cached))
 
-    def run_java_scan_thread(self, deep=False):
+    def run_java_scan_thread(self, task=None, deep=False, quiet=False):
+        # quiet: cached results are already on screen, refresh them in place
         if hasattr(self, 'deep_scan_btn'):
             try: self.after(0, lambda: self.deep_scan_btn.configure(state="disabled"))
             except: pass
-        if deep: self.after(0, lambda: self.detect_status.configure(text="Deep scanning system for Java... (may take a while)"))
+        if quiet: pass
+        elif deep: self.after(0, lambda: self.detect_status.configure(text="Deep scanning system for Java... (may take a while)"))
         else: self.after(0, lambda: self.detect_status.configure(text="Scanning system for Java..."))
-        try: self.after(0, lambda: (self.detect_progress.pack(pady=10), self.detect_progress.set(0), self.detect_progress.start()))
-        except: pass
+        if not quiet:
+            try: self.after(0, lambda: (self.detect_progress.pack(pady=10), self.detect_progress.set(0), self.detect_progress.start()))
+            except: pass
         try:
-            found_javas = find_system_javas_enhanced(deep=deep)
+            found_javas = self.core.scan_java(deep=deep)
             self.after(0, lambda: self.display_java_results(found_javas))
         finally:
             if hasattr(self, 'deep_scan_btn'):
                 try: self.after(0, lambda: self.deep_scan_btn.configure(state="normal"))
                 except: pass
 
-    def display_java_results(self, javas):
+    def display_java_results(self, javas, refreshing=False):
         if not self.detect_win.winfo_exists(): return
         self.detect_progress.stop()
         self.detect_progress.pack_forget()
-        self.detect_status.configure(text=f"Found {len(javas)} Java versions")
+        self.detect_status.configure(text=f"Found {len(javas)} Java versions" + (" (refreshing...)" if refreshing else ""))
         self.detect_scroll.pack(fill="both", expand=True, padx=20, pady=20)
         for widget in self.detect_scroll.winfo_children(): widget.destroy()
         if not javas:
@@ -837,4 +1200,4 @@ class OrbusLauncher(ctk.CTk):
         self.save_config()
 
 if __name__ == "__main__":
-    app = OrbusLauncher(); app.mainloop()
\ No newline at end of file
+    app = OrbusLauncher(); app.mainloop()
\ No newline at end of file
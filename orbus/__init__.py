@@ -0,0 +1 @@
+# Non-GUI building blocks used by launcher.py.
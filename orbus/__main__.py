@@ -0,0 +1,5 @@
+import sys
+
+from orbus.cli import main
+
+sys.exit(main())
@@ -0,0 +1,60 @@
+import os
+import hashlib
+
+# -------------------------
+# AppCDS Archives
+# -------------------------
+# Opt-in per instance. The archive lives in <instance>/.orbus/cds/<key>.jsa,
+# where key covers the installed version files, the Java binary and the mods
+# folder, so any change there simply points at a new (missing) archive and the
+# old ones are deleted.
+#  - Java 19+: -XX:+AutoCreateSharedArchive, the JVM trains and refreshes it.
+#  - Java 13-18: the first launch is a training run with
+#    -XX:ArchiveClassesAtExit, later launches use -XX:SharedArchiveFile.
+#  - Older Java: nothing, dynamic archives don't exist there.
+ARCHIVE_DIR = os.path.join(".orbus", "cds")
+MIN_JAVA = 13
+AUTO_JAVA = 19
+
+
+def _tree_stat(root):
+    entries = []
+    for dirpath, _, filenames in os.walk(root):
+        for f in filenames:
+            try: st = os.stat(os.path.join(dirpath, f))
+            except OSError: continue
+            entries.append(f"{os.path.relpath(os.path.join(dirpath, f), root)}:{st.st_size}:{st.st_mtime_ns}")
+    return sorted(entries)
+
+def archive_key(inst_dir, java, version_fp):
+    h = hashlib.sha1()
+    try:
+        st = os.stat(os.path.realpath(java))
+        h.update(f"{os.path.realpath(java)}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    except OSError: h.update(java.encode())
+    h.update(f"{version_fp}\n".encode())
+    for entry in _tree_stat(os.path.join(inst_dir, "mods")): h.update(entry.encode() + b"\n")
+    return h.hexdigest()[:16]
+
+def cds_args(inst_dir, java, java_major, version_fp):
+    # Extra JVM args for this launch, [] when AppCDS can't be used
+    if not java_major or java_major < MIN_JAVA or not version_fp: return []
+    d = os.path.join(inst_dir, ARCHIVE_DIR)
+    os.makedirs(d, exist_ok=True)
+    archive = os.path.join(d, archive_key(inst_dir, java, version_fp) + ".jsa")
+    for f in os.listdir(d):
+        stale = os.path.join(d, f)
+        if stale != archive:
+            try: os.remove(stale)
+            except OSError: pass
+    if java_major >= AUTO_JAVA: return ["-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={archive}"]
+    if os.path.isfile(archive) and os.path.getsize(archive) > 0: return [f"-XX:SharedArchiveFile={archive}"]
+    return [f"-XX:ArchiveClassesAtExit={archive}"]
+
+def clear_archives(inst_dir):
+    d = os.path.join(inst_dir, ARCHIVE_DIR)
+    try: files = os.listdir(d)
+    except OSError: return
+    for f in files:
+        try: os.remove(os.path.join(d, f))
+        except OSError: pass
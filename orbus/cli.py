@@ -0,0 +1,204 @@
+import os
+import sys
+import json
+import argparse
+
+from orbus.jvmargs import PROFILES
+
+# -------------------------
+# Headless CLI
+# -------------------------
+# python -m orbus <command> (or python launcher.py <command>). Uses the same
+# config, store and install state as the GUI but never imports Tk, and only
+# imports what the chosen command needs. Every command works on its own
+# process-wide state, so scripts can run many of these in parallel.
+
+def _core():
+    from orbus.core import Orbus
+    return Orbus()
+
+def _status(args):
+    if args.quiet: return {}
+    return {"setStatus": lambda t: print(f"  {t}", file=sys.stderr)}
+
+def _names(core, args):
+    names = list(core.instances) if args.all else args.names
+    missing = [n for n in names if n not in core.instances]
+    if missing: raise SystemExit(f"Unknown instance(s): {', '.join(missing)}")
+    return names
+
+def _ram(value):
+    # GB, or "auto" to size the heap at launch
+    if value == "auto": return value
+    try: return int(value)
+    except ValueError: raise argparse.ArgumentTypeError("expected a number of GB or 'auto'")
+
+def cmd_list(args):
+    core = _core()
+    rows = [dict(name=n, **{k: core.instances.field(n, k) for k in ("version", "loader")}) for n in core.instances]
+    if args.json: print(json.dumps(rows, indent=2))
+    else:
+        for r in rows: print(f"{r['name']}\t{r['version']}\t{r['loader']}")
+    return 0
+
+def cmd_install(args):
+    core = _core()
+    from orbus.core import new_instance
+    if args.name not in core.instances:
+        core.instances[args.name] = new_instance(version=args.version, loader=args.loader, loader_version=args.loader_version, username=args.username, ram=args.ram, appcds=args.appcds, jvm_profile=args.jvm_profile)
+    else:
+        d = core.instances[args.name]
+        for k in ("version", "loader", "loader_version", "username", "ram", "appcds", "jvm_profile"):
+            if getattr(args, k) is not None: d[k] = getattr(args, k)
+    core.instances.flush()
+    version_id, installed = core.install(args.name, callback=_status(args), force=args.force)
+    print(f"{args.name}: {version_id} {'installed' if installed else 'already installed'}")
+    return 0
+
+def cmd_import(args):
+    core = _core()
+    path = args.path
+    if not os.path.isfile(path):
+        print(f"  Downloading Modrinth project {path}...", file=sys.stderr)
+        path = core.download_modrinth_pack(path)
+    name = core.import_pack(path, username=args.username or "", name=args.name, prefetch=False)
+    core.instances.flush()
+    print(name)
+    if args.install:
+        version_id, _ = core.install(name, callback=_status(args))
+        print(f"{name}: {version_id} installed")
+    return 0
+
+def cmd_prefetch(args):
+    core = _core()
+    failed = 0
+    for name in _names(core, args):
+        try:
+            version_id, installed = core.install(name, callback=_status(args))
+            print(f"{name}: {version_id} {'installed' if installed else 'already installed'}")
+        except Exception as e:
+            print(f"{name}: failed: {e}", file=sys.stderr); failed += 1
+    return 1 if failed else 0
+
+def cmd_launch(args):
+    core = _core()
+    if args.name not in core.instances: raise SystemExit(f"Unknown instance: {args.name}")
+    from orbus.launchtimes import LaunchTimer
+    timer = LaunchTimer()
+    cmd, inst_dir, _ = core.launch_command(args.name, username=args.username, callback=_status(args), timer=timer)
+    if args.print_command:
+        print(json.dumps(cmd)); return 0
+    if args.detach:
+        import subprocess
+        process = subprocess.Popen(cmd, cwd=inst_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        print(f"  Started {args.name} (pid {process.pid})", file=sys.stderr)
+        return 0
+    echo = None if args.quiet else (lambda line: sys.stdout.write(line))
+    core.sessions.telemetry_interval = args.telemetry_interval
+    def on_ready(s, event):
+        if s is session and event == "ready": print(f"  Ready after {timer.marks['ready']:.1f}s", file=sys.stderr)
+    core.sessions.subscribe(on_ready)
+    session = core.sessions.start(args.name, cmd, inst_dir, on_line=echo, timer=timer)
+    print(f"  Started {args.name} (pid {session.pid})", file=sys.stderr)
+    if session.wait(args.smoke): code = session.exit_code
+    else:
+        # Smoke test: still running after --smoke seconds counts as success
+        session.stop()
+        session.wait(15)
+        code = 0
+    if args.telemetry and session.telemetry:
+        session.telemetry.ring.write_csv(args.telemetry)
+        print(f"  Telemetry written to {args.telemetry}", file=sys.stderr)
+    return code
+
+def cmd_times(args):
+    from orbus.launchtimes import PHASE_LABELS
+    core = _core()
+    if args.name not in core.instances: raise SystemExit(f"Unknown instance: {args.name}")
+    records, summary = core.launch_times(args.name, args.last)
+    if args.json:
+        print(json.dumps({"launches": len(records), "summary": summary}, indent=2)); return 0
+    if not summary:
+        print(f"No recorded launches for {args.name}"); return 0
+    print(f"{args.name}: last {min(len(records), args.last)} of {len(records)} launches")
+    print(f"{'phase':<24}{'last':>9}{'p50':>9}{'p95':>9}")
+    for key, s in summary.items():
+        print(f"{PHASE_LABELS[key]:<24}" + "".join(f"{s[k]:>8.2f}s" for k in ("last", "p50", "p95")))
+    return 0
+
+def cmd_scan_java(args):
+    from orbus import paths
+    from orbus.java import find_system_javas_enhanced, cached_javas
+    javas = cached_javas(paths.JAVA_CACHE_FILE) if args.cached else find_system_javas_enhanced(deep=args.deep, cache_file=paths.JAVA_CACHE_FILE)
+    if args.json: print(json.dumps(javas, indent=2))
+    else:
+        for j in javas: print(f"{j['version']}\t{j['arch']}\t{j['path']}")
+    return 0
+
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="orbus", description="Orbus launcher, headless.")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("list", help="list instances")
+    s.add_argument("--json", action="store_true")
+    s.set_defaults(func=cmd_list)
+
+    s = sub.add_parser("install", help="create/update an instance and install its version + loader")
+    s.add_argument("name")
+    s.add_argument("--version")
+    s.add_argument("--loader", choices=["Vanilla", "Fabric", "Quilt"])
+    s.add_argument("--loader-version")
+    s.add_argument("--username")
+    s.add_argument("--ram", type=_ram, help="heap size in GB, or 'auto'")
+    s.add_argument("--jvm-profile", choices=list(PROFILES), help="GC profile: " + ", ".join(PROFILES.values()))
+    s.add_argument("--appcds", action=argparse.BooleanOptionalAction, help="use an AppCDS archive to speed up game startup")
+    s.add_argument("--force", action="store_true", help="re-verify even if the install state says it's complete")
+    s.add_argument("-q", "--quiet", action="store_true")
+    s.set_defaults(func=cmd_install)
+
+    s = sub.add_parser("import-mrpack", help="import a .mrpack/.zip file or a Modrinth project id")
+    s.add_argument("path")
+    s.add_argument("--name", help="instance name (defaults to the pack's name)")
+    s.add_argument("--username")
+    s.add_argument("--install", action="store_true", help="also install the version + loader")
+    s.add_argument("-q", "--quiet", action="store_true")
+    s.set_defaults(func=cmd_import)
+
+    s = sub.add_parser("launch", help="install what's missing and start an instance")
+    s.add_argument("name")
+    s.add_argument("--username")
+    s.add_argument("--detach", action="store_true", help="return as soon as the game has started (output isn't captured)")
+    s.add_argument("--smoke", type=float, metavar="SECONDS", help="stop the game after SECONDS; exit 0 if it was still running")
+    s.add_argument("--print-command", action="store_true", help="print the launch command instead of running it")
+    s.add_argument("--telemetry", metavar="CSV", help="write CPU/memory/thread/disk samples of the game to CSV when it exits")
+    s.add_argument("--telemetry-interval", type=float, default=1.0, metavar="SECONDS", help="seconds between telemetry samples, 0 to disable")
+    s.add_argument("-q", "--quiet", action="store_true", help="don't echo game output")
+    s.set_defaults(func=cmd_launch)
+
+    s = sub.add_parser("times", help="launch phase timings (last, p50, p95) for an instance")
+    s.add_argument("name")
+    s.add_argument("--last", type=int, default=20, metavar="N", help="summarize the newest N launches")
+    s.add_argument("--json", action="store_true")
+    s.set_defaults(func=cmd_times)
+
+    s = sub.add_parser("scan-java", help="find Java installations")
+    s.add_argument("--deep", action="store_true")
+    s.add_argument("--cached", action="store_true", help="only print the last scan's results")
+    s.add_argument("--json", action="store_true")
+    s.set_defaults(func=cmd_scan_java)
+
+    s = sub.add_parser("prefetch", help="install versions + loaders for instances")
+    s.add_argument("names", nargs="*")
+    s.add_argument("--all", action="store_true")
+    s.add_argument("-q", "--quiet", action="store_true")
+    s.set_defaults(func=cmd_prefetch)
+    return p
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try: return args.func(args)
+    except KeyboardInterrupt: return 130
+    except Exception as e:
+        print(f"orbus {args.command}: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,55 @@
+import json
+import threading
+
+from orbus.fsutil import atomic_write_json
+from orbus.installstate import fingerprint
+
+# -------------------------
+# Launch Command Cache
+# -------------------------
+# get_minecraft_command re-reads the whole inheritsFrom chain and rebuilds the
+# classpath on every call. The result only depends on the installed version
+# files and a handful of settings, so it is cached per (version id, java,
+# jvm args, game dir) and invalidated by the same fingerprint the install
+# manifest uses. The username is the only per-launch field and is left as a
+# placeholder in the cached argv.
+USERNAME_SLOT = "${orbus_username}"
+MAX_ENTRIES = 64
+
+
+def build_command(version_id, mc_dir, java, jvm_args, inst_dir, username=USERNAME_SLOT):
+    import minecraft_launcher_lib
+    opts = {"username": username, "uuid": "0", "token": "0", "gameDir": inst_dir, "executablePath": java, "jvmArguments": list(jvm_args)}
+    cmd = minecraft_launcher_lib.command.get_minecraft_command(version_id, mc_dir, opts)
+    if "--gameDir" not in cmd: cmd.extend(["--gameDir", inst_dir])
+    else:
+        for i, arg in enumerate(cmd):
+            if arg == "--gameDir": cmd[i+1] = inst_dir
+    return cmd
+
+
+class CommandCache:
+    def __init__(self, path, mc_dir):
+        self.path = path
+        self.mc_dir = mc_dir
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r") as f: self._entries = json.load(f)
+        except (OSError, ValueError): self._entries = {}
+
+    def get(self, version_id, java, jvm_args, inst_dir, username, fp=None):
+        key = json.dumps([version_id, java, list(jvm_args), inst_dir])
+        fp = fp or fingerprint(version_id, self.mc_dir)
+        with self._lock: entry = self._entries.get(key)
+        if not fp or not entry or entry.get("fp") != fp:
+            entry = {"fp": fp, "argv": build_command(version_id, self.mc_dir, java, jvm_args, inst_dir)}
+            if fp:
+                with self._lock:
+                    self._entries.pop(key, None)
+                    self._entries[key] = entry
+                    while len(self._entries) > MAX_ENTRIES: self._entries.pop(next(iter(self._entries)))
+                    self._save()
+        return [username if a == USERNAME_SLOT else a for a in entry["argv"]]
+
+    def _save(self):
+        atomic_write_json(self.path, self._entries)
@@ -0,0 +1,171 @@
+import os
+import json
+import threading
+from collections.abc import MutableMapping
+from urllib.parse import quote
+
+from orbus.fsutil import atomic_write_json, file_lock
+
+# -------------------------
+# Instance Config Store
+# -------------------------
+# One small JSON file per instance plus index.json holding the sidebar order
+# and a summary of each instance (enough to draw the sidebar without opening
+# every file). Instance files are only read on first access; save() is
+# debounced and flush() rewrites just the instances whose content changed,
+# each through a temp file + os.replace. The index is merged with what is on
+# disk under a file lock, so several launcher/CLI processes can add instances
+# at the same time without dropping each other's entries.
+SUMMARY_KEYS = ("icon_path", "version", "loader")
+
+
+class InstanceStore(MutableMapping):
+    def __init__(self, root, legacy_file=None, debounce=0.5):
+        self.root = root
+        self.inst_dir = os.path.join(root, "instances")
+        self.index_file = os.path.join(root, "index.json")
+        self.debounce = debounce
+        self._lock = threading.RLock()
+        self._timer = None
+        self._call_later = self._cancel_later = None
+        self._data = {}      # name -> dict, only for loaded instances
+        self._written = {}   # name -> json text last written/read
+        self._deleted = set()
+        self._index_written = None
+        os.makedirs(self.inst_dir, exist_ok=True)
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f: index = json.load(f)
+        except (OSError, ValueError): index = None
+        if index is None:
+            self._order, self._summary = [], {}
+            if legacy_file and os.path.exists(legacy_file): self._migrate(legacy_file)
+        else:
+            self._order, self._summary = index.get("order", []), index.get("summary", {})
+            self._index_written = self._index_json()
+
+    def _migrate(self, legacy_file):
+        # Old single-file orbus_config.json; left in place untouched
+        try:
+            with open(legacy_file, "r") as f: legacy = json.load(f)
+        except (OSError, ValueError): return
+        for name, d in legacy.items(): self[name] = d
+        self.flush()
+
+    def _path(self, name):
+        return os.path.join(self.inst_dir, quote(name, safe="") + ".json")
+
+    def _index_json(self):
+        return json.dumps({"order": self._order, "summary": self._summary}, sort_keys=True)
+
+    # --- Mapping interface (ordered like the sidebar) ---
+    def __getitem__(self, name):
+        with self._lock:
+            if name in self._data: return self._data[name]
+            if name not in self._summary: raise KeyError(name)
+            try:
+                with open(self._path(name), "r", encoding="utf-8") as f: text = f.read()
+                d = json.loads(text)
+            except (OSError, ValueError): d, text = dict(self._summary[name]), None
+            self._data[name], self._written[name] = d, text
+            return d
+
+    def __setitem__(self, name, d):
+        with self._lock:
+            if name not in self._summary: self._order.append(name)
+            self._summary[name] = {k: d.get(k) for k in SUMMARY_KEYS}
+            self._data[name] = d
+            self._written.pop(name, None)
+            self._deleted.discard(name)
+
+    def __delitem__(self, name):
+        with self._lock:
+            if name not in self._summary: raise KeyError(name)
+            del self._summary[name]
+            self._order.remove(name)
+            self._data.pop(name, None)
+            self._written.pop(name, None)
+            self._deleted.add(name)
+
+    def __contains__(self, name):
+        return name in self._summary
+
+    def __iter__(self):
+        return iter(list(self._order))
+
+    def __len__(self):
+        return len(self._order)
+
+    def field(self, name, key, default=None):
+        # Summary fields without loading the instance file
+        with self._lock:
+            if name in self._data: return self._data[name].get(key, default)
+            return self._summary.get(name, {}).get(key, default)
+
+    def reorder(self, new_order):
+        with self._lock:
+            if sorted(new_order) != sorted(self._order): raise ValueError("reorder must keep the same instances")
+            self._order = list(new_order)
+
+    # --- Persistence ---
+    def set_scheduler(self, call_later, cancel):
+        # e.g. Tk's after/after_cancel. Debounced flushes then run on the UI
+        # thread, the one that edits instance dicts in place, instead of a
+        # Timer thread that could serialize a dict mid-edit.
+        self._call_later, self._cancel_later = call_later, cancel
+
+    def _cancel(self, timer):
+        if timer is None: return
+        if self._call_later: self._cancel_later(timer)
+        else: timer.cancel()
+
+    def _take_timer(self):
+        with self._lock:
+            timer, self._timer = self._timer, None
+        return timer
+
+    def save(self):
+        # Coalesces bursts of saves into one flush. Tk's after() is never
+        # called under self._lock: from a worker thread it waits on the UI
+        # thread, which may itself be waiting on the lock.
+        self._cancel(self._take_timer())
+        if self._call_later:
+            timer = self._call_later(int(self.debounce * 1000), self.flush)
+        else:
+            timer = threading.Timer(self.debounce, self.flush)
+            timer.daemon = True
+            timer.start()
+        with self._lock:
+            old, self._timer = self._timer, timer
+        # Another save slipped in between; the newest timer wins
+        self._cancel(old)
+
+    def flush(self):
+        self._cancel(self._take_timer())
+        with self._lock:
+            for name, d in self._data.items():
+                text = json.dumps(d, indent=4)
+                if text == self._written.get(name): continue
+                atomic_write_json(self._path(name), d, indent=4)
+                self._written[name] = text
+                self._summary[name] = {k: d.get(k) for k in SUMMARY_KEYS}
+            for name in self._deleted:
+                try: os.remove(self._path(name))
+                except OSError: pass
+            with file_lock(self.index_file + ".lock"):
+                self._merge_disk_index()
+                self._deleted.clear()
+                index = self._index_json()
+                if index != self._index_written:
+                    atomic_write_json(self.index_file, {"order": self._order, "summary": self._summary})
+                    self._index_written = index
+
+    def _merge_disk_index(self):
+        # Picks up instances other processes added since we last wrote
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f: disk = json.load(f)
+        except (OSError, ValueError): return
+        if json.dumps(disk, sort_keys=True) == self._index_written: return
+        for name in disk.get("order", []):
+            if name in self._summary or name in self._deleted: continue
+            self._order.append(name)
+            self._summary[name] = disk.get("summary", {}).get(name, {})
@@ -0,0 +1,226 @@
+import os
+import json
+import shutil
+import zipfile
+import threading
+import subprocess
+from functools import cached_property
+
+from orbus import paths
+from orbus.config import InstanceStore
+from orbus.tasks import TaskScheduler
+from orbus.launchtimes import span
+
+# -------------------------
+# Launcher Core
+# -------------------------
+# Everything the GUI and the CLI share: the instance config, installs, pack
+# imports and launch command building. Services that pull in requests or
+# minecraft_launcher_lib are only built on first use, so cheap commands
+# (listing instances, reading config) start fast.
+DEFAULT_INSTANCE = {"username": "", "version": "1.21.1", "loader": "Vanilla", "loader_version": "latest", "ram": 4, "java_path": "", "icon_path": "", "appcds": False, "jvm_profile": "balanced"}
+MODRINTH_PROJECT_URL = "https://api.modrinth.com/v2/project/{}/version"
+
+
+def new_instance(**settings):
+    d = dict(DEFAULT_INSTANCE)
+    d.update({k: v for k, v in settings.items() if v is not None})
+    return d
+
+
+class Orbus:
+    def __init__(self):
+        os.makedirs(paths.INSTANCES_DIR, exist_ok=True)
+        self.instances = InstanceStore(paths.CONFIG_DIR, legacy_file=paths.CONFIG_FILE)
+        self.tasks = TaskScheduler()
+
+    # --- Lazily built services ---
+    @cached_property
+    def downloader(self):
+        from orbus.downloads import DownloadEngine
+        return DownloadEngine()
+
+    @cached_property
+    def store(self):
+        from orbus.store import ArtifactStore
+        return ArtifactStore(paths.STORE_DIR)
+
+    @cached_property
+    def meta(self):
+        from orbus.metacache import MetaCache, DEFAULT_TTL
+        return MetaCache(paths.META_CACHE_DIR, self.downloader.session, ttl=int(os.environ.get("ORBUS_META_TTL", DEFAULT_TTL)))
+
+    @cached_property
+    def install_state(self):
+        from orbus.installstate import InstallState
+        return InstallState(paths.INSTALL_STATE_FILE, paths.MINECRAFT_DIR)
+
+    @cached_property
+    def command_cache(self):
+        from orbus.cmdcache import CommandCache
+        return CommandCache(paths.COMMAND_CACHE_FILE, paths.MINECRAFT_DIR)
+
+    @cached_property
+    def prefetcher(self):
+        from orbus.prefetch import Prefetcher
+        return Prefetcher(self.tasks, self.meta, self.install_state)
+
+    @cached_property
+    def sessions(self):
+        from orbus.sessions import SessionManager
+        return SessionManager(self.spawn, self.tasks)
+
+    # --- Instances ---
+    def instance_dir(self, name):
+        return os.path.abspath(os.path.join(paths.INSTANCES_DIR, name))
+
+    def prefetch(self, name, sticky=False):
+        d = self.instances.get(name) or {}
+        return self.prefetcher.request(d.get("version"), d.get("loader", "Vanilla"), d.get("loader_version", "latest"), sticky=sticky)
+
+    def install(self, name, callback=None, force=False, timer=None):
+        # Blocking install/verify of an instance's version + loader.
+        # Returns (launch version id, installed anything).
+        d = self.instances[name]
+        version_id, _, installed = self.prefetcher.ensure(d.get("version"), d.get("loader", "Vanilla"), d.get("loader_version", "latest"), callback=callback, force=force, timer=timer)
+        return version_id, installed
+
+    # --- Pack import ---
+    def download_modrinth_pack(self, project_id, task=None):
+        if task: task.report(message="Fetching version info...")
+        r = self.downloader.session.get(MODRINTH_PROJECT_URL.format(project_id), timeout=15)
+        r.raise_for_status()
+        v = r.json()[0]
+        fi = next((f for f in v['files'] if f.get('primary')), v['files'][0])
+        dest = os.path.join(paths.DOWNLOADS_DIR, f"{project_id}-{v['id']}.mrpack")
+        def on_progress(done, total, speed):
+            if task: task.report(done / total if total else None, f"Downloading {fi['filename']}... {speed / 1048576:.1f} MB/s")
+        self.downloader.fetch_resumable(fi['url'], dest, fi.get('size', 0), fi.get('hashes'), progress=on_progress, cancel=task.cancel_event if task else None)
+        return dest
+
+    def import_pack(self, path, username="", name=None, task=None, prefetch=True):
+        # .mrpack (or any zip with modrinth.index.json) or a plain instance zip.
+        # Returns the new instance name.
+        with zipfile.ZipFile(path, 'r') as z:
+            if "modrinth.index.json" in z.namelist(): return self._install_mrpack(z, username, name, task, prefetch)
+            return self._install_basic_zip(z, path, name, task, prefetch)
+
+    def _register(self, name, settings, prefetch):
+        self.instances[name] = settings
+        self.instances.save()
+        p = self.instance_dir(name)
+        os.makedirs(p, exist_ok=True)
+        if prefetch: self.prefetch(name, sticky=True)
+        return p
+
+    def _install_mrpack(self, z, username, name, task, prefetch):
+        from orbus.downloads import mrpack_job
+        from orbus.extract import plan_extract, MRPACK_OVERRIDES
+        idx = json.loads(z.read("modrinth.index.json"))
+        n = name or idx.get("name", "Pack"); d = idx["dependencies"]
+        ldr = "Fabric" if "fabric-loader" in d else "Quilt" if "quilt-loader" in d else "Vanilla"
+        p = self._register(n, new_instance(username=username, version=d["minecraft"], loader=ldr), prefetch)
+        overrides = plan_extract(z, p, MRPACK_OVERRIDES)
+        jobs, links = self.store.stage_jobs(mrpack_job(f_o, p) for f_o in idx.get("files", []))
+        self.store.set_refs(n, [sha for sha, _ in links])
+        def on_progress(done, total, speed):
+            if task: task.report(done / total if total else None, f"Downloading {len(jobs)} files... {speed / 1048576:.1f} MB/s")
+        self.downloader.download_all(jobs, progress=on_progress, cancel=task.cancel_event if task else None)
+        for sha, dst in links: self.store.materialize(sha, dst)
+        self._extract(z, overrides, task)
+        return n
+
+    def _install_basic_zip(self, z, p_orig, name, task, prefetch):
+        from orbus.extract import plan_extract
+        n = name or os.path.splitext(os.path.basename(p_orig))[0]
+        p = self._register(n, new_instance(), prefetch)
+        self._extract(z, plan_extract(z, p), task)
+        mods = os.path.join(p, "mods")
+        jars = [os.path.join(mods, f) for f in os.listdir(mods) if f.endswith(".jar")] if os.path.isdir(mods) else []
+        self.store.set_refs(n, [self.store.adopt(j) for j in jars])
+        return n
+
+    def _extract(self, z, plan, task=None):
+        from orbus.extract import extract_all
+        def on_progress(done, total):
+            if task: task.report(done / total if total else None, f"Extracting... {done / 1048576:.0f}/{total / 1048576:.0f} MB")
+        extract_all(z.filename, plan, progress=on_progress, cancel=task.cancel_event if task else None)
+
+    # --- Launch ---
+    def find_java(self, settings):
+        custom_java = settings.get("java_path", "").strip()
+        if custom_java and os.path.exists(custom_java): return custom_java
+        return shutil.which("javaw") or shutil.which("java") or "java"
+
+    def launch_command(self, name, username=None, callback=None, force=False, timer=None):
+        # Installs whatever is missing and returns (argv, game dir, installed).
+        # timer: an optional LaunchTimer that gets a span per phase.
+        with span(timer, "config"):
+            d = dict(self.instances[name])
+            user = username or d.get("username")
+            if not d.get("version") or not user: raise ValueError("Version or Username missing.")
+            inst_dir = self.instance_dir(name)
+            os.makedirs(inst_dir, exist_ok=True)
+        version_id, installed = self.install(name, callback=callback, force=force, timer=timer)
+        if callback and "setStatus" in callback: callback["setStatus"]("Launching...")
+        with span(timer, "java"):
+            java = self.find_java(d)
+            major = self.java_major(java)
+        with span(timer, "command"):
+            jvm_args = self.jvm_args(d, java, major, inst_dir) + self.cds_args(d, java, major, version_id, inst_dir)
+            cmd = self.command_cache.get(version_id, java, jvm_args, inst_dir, user)
+        if timer:
+            from orbus.jvmargs import count_mods
+            timer.info.update(version=version_id, mods=count_mods(inst_dir), installed=installed)
+        return cmd, inst_dir, installed
+
+    def launch_times(self, name, last=20):
+        # (history records, {phase: {"last", "p50", "p95", "n"}}) for one instance
+        from orbus.launchtimes import load_history, summarize
+        records = load_history(self.instance_dir(name))
+        return records, summarize(records, last)
+
+    def java_major(self, java):
+        from orbus.java import java_info, java_major
+        info = java_info(java, paths.JAVA_CACHE_FILE)
+        return java_major(info["version"]) if info else None
+
+    def jvm_args(self, settings, java, major, inst_dir):
+        from orbus.java import java_gcs
+        from orbus.jvmargs import jvm_args, heap_mb, DEFAULT_PROFILE
+        profile = settings.get("jvm_profile") or DEFAULT_PROFILE
+        gcs = java_gcs(java, paths.JAVA_CACHE_FILE) if profile == "low-latency" else None
+        return jvm_args(profile, heap_mb(settings, inst_dir, major), major, gcs)
+
+    def cds_args(self, settings, java, major, version_id, inst_dir):
+        from orbus.appcds import cds_args, clear_archives
+        if not settings.get("appcds"):
+            clear_archives(inst_dir)
+            return []
+        return cds_args(inst_dir, java, major, self.install_state.fingerprint(version_id))
+
+    def spawn(self, cmd, inst_dir, on_line=None):
+        # Starts the game with output captured into orbus_logs. on_line(line)
+        # runs on the reader thread for every line. Returns (process, reader
+        # thread); the log is complete once the reader has finished.
+        from orbus.gamelog import LogCapture
+        process = subprocess.Popen(cmd, cwd=inst_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        capture = LogCapture(os.path.join(inst_dir, "orbus_logs"))
+        def stream_reader():
+            for line in iter(process.stdout.readline, ""):
+                capture.push(line)
+                if on_line: on_line(line)
+            process.stdout.close()
+            capture.close()
+        reader = threading.Thread(target=stream_reader, daemon=True)
+        reader.start()
+        return process, reader
+
+    # --- Java ---
+    def cached_javas(self):
+        from orbus.java import cached_javas
+        return cached_javas(paths.JAVA_CACHE_FILE)
+
+    def scan_java(self, deep=False):
+        from orbus.java import find_system_javas_enhanced
+        return find_system_javas_enhanced(deep=deep, cache_file=paths.JAVA_CACHE_FILE)
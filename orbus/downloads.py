@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from orbus.fsutil import safe_join
+
+USER_AGENT = "Orbus/3.3"
+CHUNK_SIZE = 64 * 1024
+# Strongest hash first; the first one present in the index is the one checked.
+HASH_PREFERENCE = ("sha512", "sha1")
+
+
+class DownloadError(Exception):
+    pass
+
+
+class DownloadCancelled(DownloadError):
+    pass
+
+
+def make_session(pool_size=8):
+    s = requests.Session()
+    s.headers["User-Agent"] = USER_AGENT
+    retry = Retry(total=2, connect=2, read=2, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504), allowed_methods=("GET", "HEAD"))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def pick_hash(hashes):
+    for algo in HASH_PREFERENCE:
+        if hashes and hashes.get(algo): return algo, hashes[algo].lower()
+    return None, None
+
+
+def mrpack_job(entry, instance_dir):
+    # Turns one modrinth.index.json "files" entry into a download job. "name"
+    # is what errors call the file, since the store may move "dest" to a blob.
+    return {
+        "name": entry["path"],
+        "urls": list(entry.get("downloads", [])),
+        "dest": safe_join(instance_dir, entry["path"]),
+        "size": entry.get("fileSize") or 0,
+        "hashes": entry.get("hashes", {}),
+    }
+
+
+class _BatchStop:
+    # Stands in for a cancel Event inside one batch: set on the first failure,
+    # and also reads as set once the caller's own cancel is.
+    def __init__(self, cancel=None):
+        self._stop = threading.Event()
+        self._cancel = cancel
+
+    def set(self):
+        self._stop.set()
+
+    def is_set(self):
+        return self._stop.is_set() or (self._cancel is not None and self._cancel.is_set())
+
+
+class DownloadEngine:
+    # Fetches many files over one keep-alive session with a bounded worker pool.
+    # Each file streams into a temp file next to its destination, is hashed on
+    # the fly and only renamed into place once the hash matches.
+    def __init__(self, workers=8, timeout=30, chunk_size=CHUNK_SIZE):
+        self.workers = workers
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.session = make_session(workers)
+
+    def fetch(self, job, on_bytes=None, cancel=None):
+        os.makedirs(os.path.dirname(job["dest"]), exist_ok=True)
+        errors = []
+        for url in job["urls"]:
+            try:
+                self._fetch_one(url, job, on_bytes, cancel)
+                return job["dest"]
+            except DownloadCancelled: raise
+            except Exception as e: errors.append(f"{url}: {e}")
+        if not job["urls"]: errors.append("no download URLs")
+        raise DownloadError(f"{job.get('name') or os.path.basename(job['dest'])}: " + "; ".join(errors))
+
+    def _fetch_one(self, url, job, on_bytes, cancel):
+        algo, expected = pick_hash(job.get("hashes"))
+        h = hashlib.new(algo) if algo else None
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(job["dest"]), prefix=".orbus-", suffix=".part")
+        written = 0
+        try:
+            with os.fdopen(fd, "wb") as f, self.session.get(url, stream=True, timeout=self.timeout) as r:
+                r.raise_for_status()
+                for chunk in r.iter_content(self.chunk_size):
+                    if cancel is not None and cancel.is_set(): raise DownloadCancelled("Download cancelled")
+                    f.write(chunk)
+                    if h: h.update(chunk)
+                    written += len(chunk)
+                    if on_bytes: on_bytes(len(chunk))
+            if h and h.hexdigest() != expected:
+                raise DownloadError(f"{algo} mismatch")
+            if job.get("size") and written != job["size"]:
+                raise DownloadError(f"size mismatch ({written} != {job['size']})")
+            os.replace(tmp, job["dest"])
+        except BaseException:
+            # Give back the bytes we reported so the aggregate stays honest when
+            # the next mirror starts this file over.
+            if on_bytes and written: on_bytes(-written)
+            try: os.remove(tmp)
+            except OSError: pass
+            raise
+
+    def download_all(self, jobs, progress=None, cancel=None, interval=0.1):
+        # progress(done_bytes, total_bytes, bytes_per_sec) is called from worker
+        # threads at most every `interval` seconds, plus once at the end.
+        jobs = list(jobs)
+        if not jobs: return []
+        stop = _BatchStop(cancel)
+        total = sum(j.get("size") or 0 for j in jobs)
+        state = {"done": 0, "last": 0.0}
+        lock = threading.Lock()
+        start = time.monotonic()
+
+        def report(force=False):
+            now = time.monotonic()
+            if not force and now - state["last"] < interval: return
+            state["last"] = now
+            if progress: progress(state["done"], total, state["done"] / max(now - start, 1e-6))
+
+        def on_bytes(n):
+            with lock:
+                state["done"] += n
+                report()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="orbus-dl") as pool:
+            futures = [pool.submit(self.fetch, j, on_bytes, stop) for j in jobs]
+            try:
+                results = [f.result() for f in as_completed(futures)]
+            except BaseException:
+                # First failure stops the batch; queued jobs bail out immediately.
+                # The caller's cancel stays untouched so the error isn't taken
+                # for a cancellation.
+                stop.set()
+                for f in futures: f.cancel()
+                raise
+        with lock: report(force=True)
+        return results
+
+    def fetch_resumable(self, url, dest, size=0, hashes=None, progress=None, cancel=None, interval=0.1):
+        # Streams one large file into <dest>.part. A small journal next to it
+        # (<dest>.part.json) records what the part belongs to, so an interrupted
+        # download picks up where it left off with an HTTP Range request.
+        part, journal_path = dest + ".part", dest + ".part.json"
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        algo, expected = pick_hash(hashes)
+        journal = {"url": url, "size": size, "hash": [algo, expected], "validator": None}
+        offset = 0
+        try:
+            with open(journal_path, "r") as f: old = json.load(f)
+            if old.get("url") == url and old.get("size") == size and old.get("hash") == journal["hash"] and os.path.exists(part):
+                offset = os.path.getsize(part)
+                journal["validator"] = old.get("validator")
+        except (OSError, ValueError): pass
+        if size and offset > size: offset = 0
+
+        h = hashlib.new(algo) if algo else None
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if journal["validator"]: headers["If-Range"] = journal["validator"]
+        with self.session.get(url, stream=True, timeout=self.timeout, headers=headers) as r:
+            if r.status_code == 416 and not (size and offset == size):
+                # The part doesn't line up with the remote file any more.
+                for p in (part, journal_path):
+                    try: os.remove(p)
+                    except OSError: pass
+                return self.fetch_resumable(url, dest, size, hashes, progress, cancel, interval)
+            if r.status_code != 416:
+                r.raise_for_status()
+                if r.status_code != 206: offset = 0  # Server ignored the range or the file changed
+                if not size:
+                    length = r.headers.get("Content-Length")
+                    size = offset + int(length) if length and length.isdigit() else 0
+                journal["validator"] = r.headers.get("ETag") or r.headers.get("Last-Modified")
+                with open(journal_path + ".tmp", "w") as f: json.dump(journal, f)
+                os.replace(journal_path + ".tmp", journal_path)
+            if h and offset:
+                with open(part, "rb") as f:
+                    for chunk in iter(lambda: f.read(self.chunk_size), b""): h.update(chunk)
+            if r.status_code != 416:
+                done, start, last = offset, time.monotonic(), 0.0
+                with open(part, "ab" if offset else "wb") as f:
+                    for chunk in r.iter_content(self.chunk_size):
+                        if cancel is not None and cancel.is_set(): raise DownloadCancelled("Download cancelled")
+                        f.write(chunk)
+                        if h: h.update(chunk)
+                        done += len(chunk)
+                        now = time.monotonic()
+                        if progress and now - last >= interval:
+                            last = now
+                            progress(done, size, (done - offset) / max(now - start, 1e-6))
+
+        if size and os.path.getsize(part) != size:
+            raise DownloadError(f"{os.path.basename(dest)}: incomplete download ({os.path.getsize(part)} of {size} bytes)")
+        if h and h.hexdigest() != expected:
+            # A corrupt part can't be resumed; start clean next time.
+            for p in (part, journal_path):
+                try: os.remove(p)
+                except OSError: pass
+            raise DownloadError(f"{os.path.basename(dest)}: {algo} mismatch")
+        os.replace(part, dest)
+        try: os.remove(journal_path)
+        except OSError: pass
+        if progress: progress(size, size, 0)
+        return dest
@@ -0,0 +1,94 @@
+import os
+import time
+import posixpath
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from orbus.fsutil import safe_join
+
+# -------------------------
+# Pack Extraction
+# -------------------------
+# Members are streamed through a fixed-size buffer (never read whole into
+# memory) by a small pool of workers, each with its own ZipFile handle since
+# a single handle can't be shared safely between threads.
+BUFFER_SIZE = 1024 * 1024
+MRPACK_OVERRIDES = ("overrides/", "client-overrides/")
+
+
+class ExtractCancelled(Exception):
+    pass
+
+
+def plan_extract(z, root, prefixes=("",)):
+    # Maps members under each prefix onto root. Later prefixes win, so
+    # client-overrides/ replaces files from overrides/. Any path escaping root
+    # raises ValueError before anything is written.
+    plan = {}
+    for prefix in prefixes:
+        for info in z.infolist():
+            if not info.filename.startswith(prefix): continue
+            rel = info.filename[len(prefix):].rstrip("/")
+            # "./", "overrides/./" etc. name root itself: nothing to write, not an escape
+            if posixpath.normpath(rel.replace("\\", "/") or ".") == ".": continue
+            plan[safe_join(root, rel)] = info
+    return [(info, dest) for dest, info in plan.items()]
+
+
+def extract_all(zip_path, plan, workers=4, progress=None, cancel=None, interval=0.1):
+    # progress(done_bytes, total_bytes) is called from worker threads at most
+    # every `interval` seconds, plus once at the end.
+    dirs = [dest for info, dest in plan if info.is_dir()]
+    files = sorted(((info, dest) for info, dest in plan if not info.is_dir()), key=lambda e: -e[0].file_size)
+    for d in dirs: os.makedirs(d, exist_ok=True)
+    if not files: return 0
+    # Stops the other workers on the first failure; the caller's cancel is
+    # only read, never set
+    stop = threading.Event()
+    total = sum(info.file_size for info, _ in files)
+    state = {"done": 0, "last": 0.0, "next": 0}
+    lock = threading.Lock()
+
+    def report(force=False):
+        now = time.monotonic()
+        if not force and now - state["last"] < interval: return
+        state["last"] = now
+        if progress: progress(state["done"], total)
+
+    def take():
+        with lock:
+            i = state["next"]
+            state["next"] += 1
+        return files[i] if i < len(files) else None
+
+    def work():
+        # Largest members first, handed out one at a time to keep workers even
+        buf = bytearray(BUFFER_SIZE)
+        view = memoryview(buf)
+        with zipfile.ZipFile(zip_path) as z:
+            while True:
+                entry = take()
+                if entry is None: return
+                info, dest = entry
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                with z.open(info) as src, open(dest, "wb") as out:
+                    while True:
+                        if stop.is_set() or (cancel is not None and cancel.is_set()): raise ExtractCancelled(info.filename)
+                        n = src.readinto(buf)
+                        if not n: break
+                        out.write(view[:n])
+                        with lock:
+                            state["done"] += n
+                            report()
+
+    n = max(1, min(workers, len(files)))
+    with ThreadPoolExecutor(max_workers=n, thread_name_prefix="orbus-unzip") as pool:
+        futures = [pool.submit(work) for _ in range(n)]
+        try:
+            for f in as_completed(futures): f.result()
+        except BaseException:
+            stop.set()
+            raise
+    with lock: report(force=True)
+    return total
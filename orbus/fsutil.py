@@ -0,0 +1,165 @@
+import os
+import json
+import shutil
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# -------------------------
+# Path Helpers
+# -------------------------
+def safe_join(root, rel_path):
+    # Joins a pack-supplied relative path onto root, refusing anything that
+    # would land outside of it (absolute paths, "..", drive letters).
+    rel_path = rel_path.replace("\\", "/")
+    if not rel_path or rel_path.startswith("/") or os.path.splitdrive(rel_path)[0]:
+        raise ValueError(f"Unsafe path in pack: {rel_path!r}")
+    root = os.path.abspath(root)
+    dest = os.path.abspath(os.path.join(root, *rel_path.split("/")))
+    if os.path.commonpath([root, dest]) != root or dest == root:
+        raise ValueError(f"Unsafe path in pack: {rel_path!r}")
+    return dest
+
+def _tmp_name(path):
+    # Unique per process and thread, so concurrent launcher/CLI processes
+    # never share a temp file
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+def atomic_write_json(path, data, **kwargs):
+    tmp = _tmp_name(path)
+    with open(tmp, "w", encoding="utf-8") as f: json.dump(data, f, **kwargs)
+    os.replace(tmp, path)
+
+
+# -------------------------
+# Cross-Process Locks
+# -------------------------
+try: import fcntl
+except ImportError: fcntl = None
+
+@contextmanager
+def file_lock(path):
+    # Advisory exclusive lock held on a side file. Not reentrant: flock locks
+    # belong to the open file, so nesting the same path deadlocks. A no-op
+    # where fcntl doesn't exist.
+    if fcntl is None:
+        yield; return
+    with open(path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try: yield
+        finally: fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# -------------------------
+# Cheap File Copies
+# -------------------------
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+_no_reflink_devs = set()
+
+def reflink(src, dst):
+    # Copy-on-write clone (btrfs, xfs, bcachefs...). Raises OSError when the
+    # filesystem can't do it; the device is then remembered and skipped.
+    dev = os.stat(os.path.dirname(os.path.abspath(dst))).st_dev
+    if fcntl is None or dev in _no_reflink_devs: raise OSError("reflink not supported")
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d: fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError:
+        _no_reflink_devs.add(dev)
+        try: os.remove(dst)
+        except OSError: pass
+        raise
+
+def clone_file(src, dst, hardlink=True):
+    # Materializes src at dst using the cheapest method available:
+    # reflink, then hardlink (if allowed), then a plain copy. dst is replaced
+    # atomically and the method used is returned.
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    tmp = f"{dst}.orbus-tmp-{os.getpid()}-{threading.get_ident()}"
+    methods = [("reflink", reflink)]
+    if hardlink: methods.append(("hardlink", os.link))
+    methods.append(("copy", shutil.copy2))
+    for name, fn in methods:
+        try:
+            fn(src, tmp)
+            os.replace(tmp, dst)
+            return name
+        except OSError:
+            try: os.remove(tmp)
+            except OSError: pass
+            if name == "copy": raise
+
+
+# -------------------------
+# Tree Cloning
+# -------------------------
+COPY_CHUNK = 16 * 1024 * 1024
+HARDLINK_EXTS = (".jar",)  # never modified in place, safe to share
+
+def _copy_range(src, dst, offset, length):
+    with open(src, "rb") as s, open(dst, "r+b") as d:
+        # In-kernel copy where possible; falls back to read/write on EXDEV etc.
+        if hasattr(os, "copy_file_range"):
+            try:
+                while length > 0:
+                    n = os.copy_file_range(s.fileno(), d.fileno(), length, offset, offset)
+                    if not n: return
+                    offset += n; length -= n
+                return
+            except OSError: pass
+        s.seek(offset); d.seek(offset)
+        while length > 0:
+            buf = s.read(min(length, 1024 * 1024))
+            if not buf: return
+            d.write(buf); length -= len(buf)
+
+def clone_tree(src, dst, workers=8, hardlink_exts=HARDLINK_EXTS, skip=(), cancel=None):
+    # Recreates src at dst (which must not exist yet). Each file is reflinked
+    # if the filesystem allows it, hardlinked if its extension is in
+    # hardlink_exts, and otherwise copied in COPY_CHUNK pieces spread over the
+    # pool. Top-level names in `skip` are left out. Returns a Counter of the
+    # methods used.
+    os.makedirs(dst)
+    files, used = [], Counter()
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel = os.path.relpath(dirpath, src)
+        if rel == ".": dirnames[:] = [d for d in dirnames if d not in skip]
+        out = dst if rel == "." else os.path.join(dst, rel)
+        for d in list(dirnames):
+            if os.path.islink(os.path.join(dirpath, d)):
+                dirnames.remove(d); filenames.append(d)
+            else: os.makedirs(os.path.join(out, d), exist_ok=True)
+        for f in filenames:
+            if rel == "." and f in skip: continue
+            files.append((os.path.join(dirpath, f), os.path.join(out, f)))
+
+    def cheap(pair):
+        s, d = pair
+        if cancel and cancel.is_set(): return None
+        if os.path.islink(s):
+            os.symlink(os.readlink(s), d); return "symlink"
+        try:
+            reflink(s, d); return "reflink"
+        except OSError: pass
+        if s.lower().endswith(hardlink_exts):
+            try:
+                os.link(s, d); return "hardlink"
+            except OSError: pass
+        return "copy"
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orbus-clone") as pool:
+        methods = list(pool.map(cheap, files))
+        chunks, copied = [], []
+        for (s, d), method in zip(files, methods):
+            if method is None: continue
+            used[method] += 1
+            if method != "copy": continue
+            size = os.path.getsize(s)
+            with open(d, "wb") as f: f.truncate(size)
+            copied.append((s, d))
+            chunks.extend((s, d, off, min(COPY_CHUNK, size - off)) for off in range(0, size, COPY_CHUNK))
+        for fut in [pool.submit(_copy_range, *c) for c in chunks]: fut.result()
+    for s, d in copied: shutil.copystat(s, d)
+    if cancel and cancel.is_set(): raise OSError("clone cancelled")
+    return used
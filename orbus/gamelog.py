@@ -0,0 +1,166 @@
+import os
+import re
+import gzip
+import json
+import time
+import uuid
+import queue
+import shutil
+import threading
+from collections import deque
+
+# -------------------------
+# Game Output Buffering
+# -------------------------
+class LogRing:
+    # Bounded line buffer between a game's stdout reader thread and the UI.
+    # The reader pushes without ever touching Tk; the UI drains in batches on
+    # its own tick. When the UI falls behind, the oldest lines are dropped and
+    # counted instead of growing without limit.
+    def __init__(self, capacity=10000):
+        self._lines = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._dropped = 0
+
+    def push(self, line):
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen: self._dropped += 1
+            self._lines.append(line)
+
+    def drain(self):
+        # Returns (lines, dropped_since_last_drain)
+        with self._lock:
+            lines, dropped = list(self._lines), self._dropped
+            self._lines.clear()
+            self._dropped = 0
+        return lines, dropped
+
+
+# -------------------------
+# Per-Launch Log Capture
+# -------------------------
+# Every launch gets a session folder under <instance>/orbus_logs/. Output is
+# written as a series of independent gzip members ("blocks") into rotating
+# part files; the result is still a normal multi-member .gz. index.jsonl has
+# one record per block with its byte range, first line number, time span and
+# per-level line numbers, so a reader only ever inflates the blocks it needs.
+LINE_RE = re.compile(r"^\[(?:[^\]]*?\s)?(\d\d:\d\d:\d\d)(?:[.,]\d+)?\] \[[^\]]*?/([A-Z]+)\]")
+INDEXED_LEVELS = ("WARN", "ERROR", "FATAL")
+SESSION_FMT = "%Y%m%d-%H%M%S"
+
+def parse_line(line):
+    # -> (timestamp "HH:MM:SS" or None, level or None)
+    m = LINE_RE.match(line)
+    return (m.group(1), m.group(2)) if m else (None, None)
+
+
+class LogCapture:
+    def __init__(self, logs_dir, block_bytes=256 * 1024, rotate_bytes=64 * 1024 * 1024, flush_secs=2.0, keep_sessions=20):
+        self.session_id = f"{time.strftime(SESSION_FMT)}-{uuid.uuid4().hex[:6]}"
+        self.dir = os.path.join(logs_dir, self.session_id)
+        os.makedirs(self.dir, exist_ok=True)
+        prune_sessions(logs_dir, keep_sessions)
+        self.block_bytes = block_bytes
+        self.rotate_bytes = rotate_bytes
+        self.flush_secs = flush_secs
+        self._queue = queue.Queue()
+        self._part_no = 0
+        self._part = None
+        self._line_no = 0
+        self._index = open(os.path.join(self.dir, "index.jsonl"), "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="orbus-logcapture", daemon=True)
+        self._thread.start()
+
+    def push(self, line):
+        self._queue.put(line)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        block, size, done = [], 0, False
+        while not done:
+            try: line = self._queue.get(timeout=self.flush_secs)
+            except queue.Empty: line = ""
+            if line is None: done = True
+            elif line:
+                block.append(line)
+                size += len(line)
+                if size < self.block_bytes: continue
+            # Block full, idle for flush_secs, or closing
+            if block: self._write_block(block)
+            block, size = [], 0
+        if self._part: self._part.close()
+        self._index.close()
+
+    def _write_block(self, lines):
+        if self._part is None or self._part.tell() >= self.rotate_bytes:
+            if self._part: self._part.close()
+            self._part_name = f"{self._part_no:03d}.log.gz"
+            self._part = open(os.path.join(self.dir, self._part_name), "ab")
+            self._part_no += 1
+        levels, t0, t1 = {}, None, None
+        for i, line in enumerate(lines):
+            ts, level = parse_line(line)
+            if ts:
+                t0 = t0 or ts; t1 = ts
+            if level in INDEXED_LEVELS: levels.setdefault(level, []).append(self._line_no + i)
+        data = gzip.compress("".join(lines).encode("utf-8", "replace"), compresslevel=6)
+        offset = self._part.tell()
+        self._part.write(data)
+        self._part.flush()
+        rec = {"part": self._part_name, "offset": offset, "length": len(data), "line": self._line_no, "lines": len(lines), "t0": t0, "t1": t1, "levels": levels}
+        self._index.write(json.dumps(rec) + "\n")
+        self._index.flush()
+        self._line_no += len(lines)
+
+
+def list_sessions(logs_dir):
+    # Newest first
+    try: return sorted((d for d in os.listdir(logs_dir) if os.path.isfile(os.path.join(logs_dir, d, "index.jsonl"))), reverse=True)
+    except OSError: return []
+
+def prune_sessions(logs_dir, keep):
+    for old in list_sessions(logs_dir)[keep:]:
+        shutil.rmtree(os.path.join(logs_dir, old), ignore_errors=True)
+
+
+class SessionLog:
+    # Read side of a captured session. Memory use is bounded by one block.
+    def __init__(self, session_dir):
+        self.dir = session_dir
+        self.blocks = []
+        with open(os.path.join(session_dir, "index.jsonl"), "r", encoding="utf-8") as f:
+            for raw in f:
+                try: self.blocks.append(json.loads(raw))
+                except ValueError: pass  # Truncated final record after a crash
+
+    def line_count(self):
+        return sum(b["lines"] for b in self.blocks)
+
+    def count(self, level):
+        return sum(len(b["levels"].get(level, ())) for b in self.blocks)
+
+    def _read_block(self, b):
+        with open(os.path.join(self.dir, b["part"]), "rb") as f:
+            f.seek(b["offset"])
+            return gzip.decompress(f.read(b["length"])).decode("utf-8", "replace").splitlines(True)
+
+    def iter_lines(self, level=None, since=None, until=None, pattern=None):
+        # Yields (line_no, text). level restricts to WARN/ERROR/FATAL lines via
+        # the index; since/until ("HH:MM:SS") skip blocks outside the window.
+        rx = re.compile(pattern, re.IGNORECASE) if isinstance(pattern, str) else pattern
+        for b in self.blocks:
+            if level and not b["levels"].get(level): continue
+            if since and b["t1"] and b["t1"] < since: continue
+            if until and b["t0"] and b["t0"] > until: continue
+            wanted = set(b["levels"][level]) if level else None
+            for i, line in enumerate(self._read_block(b)):
+                n = b["line"] + i
+                if wanted is not None and n not in wanted: continue
+                if since or until:
+                    ts = parse_line(line)[0]
+                    if ts and ((since and ts < since) or (until and ts > until)): continue
+                if rx and not rx.search(line): continue
+                yield n, line
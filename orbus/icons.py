@@ -0,0 +1,136 @@
+import io
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from orbus.downloads import make_session
+
+# -------------------------
+# Icon Service
+# -------------------------
+# Fetches remote icons on a small fixed pool, keeps decoded thumbnails in a
+# memory LRU and the scaled-down PNGs in a size-capped disk cache. cancel_all()
+# drops everything queued or in flight, e.g. when a new search replaces the
+# result list.
+THUMB_SIZE = (48, 48)
+MAX_ICON_BYTES = 4 * 1024 * 1024
+
+
+class IconService:
+    def __init__(self, cache_dir, workers=4, memory_items=256, disk_bytes=32 * 1024 * 1024, size=THUMB_SIZE, timeout=5):
+        self.cache_dir = cache_dir
+        self.size = size
+        self.timeout = timeout
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self.session = make_session(workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orbus-icon")
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = set()
+        self._disk_usage = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".png")
+
+    def cached(self, url):
+        with self._lock:
+            img = self._memory.get(url)
+            if img is not None: self._memory.move_to_end(url)
+            return img
+
+    def fetch(self, url, callback):
+        # callback(pil_image) runs on a worker thread, and only if the request
+        # wasn't cancelled in the meantime. Memory hits call back immediately.
+        img = self.cached(url)
+        if img is not None:
+            callback(img); return
+        with self._lock:
+            gen = self._generation
+            fut = self._pool.submit(self._load, url, callback, gen)
+            self._pending.add(fut)
+        fut.add_done_callback(self._discard)
+
+    def _discard(self, fut):
+        with self._lock: self._pending.discard(fut)
+
+    def cancel_all(self):
+        with self._lock:
+            self._generation += 1
+            pending, self._pending = self._pending, set()
+        # Outside the lock: cancel() runs _discard synchronously
+        for fut in pending: fut.cancel()
+
+    def _live(self, gen):
+        return gen == self._generation
+
+    def _load(self, url, callback, gen):
+        if not self._live(gen): return
+        try:
+            img = self._from_disk(url)
+            if img is None:
+                img = self._download(url, gen)
+                if img is None: return
+            with self._lock:
+                self._memory[url] = img
+                self._memory.move_to_end(url)
+                while len(self._memory) > self.memory_items: self._memory.popitem(last=False)
+            if self._live(gen): callback(img)
+        except Exception: pass
+
+    def _from_disk(self, url):
+        from PIL import Image
+        path = self._disk_path(url)
+        try:
+            with Image.open(path) as f: img = f.copy()
+            os.utime(path)  # mtime doubles as last-used time for eviction
+            return img
+        except (OSError, ValueError): return None
+
+    def _download(self, url, gen):
+        from PIL import Image
+        buf = io.BytesIO()
+        with self.session.get(url, stream=True, timeout=self.timeout) as r:
+            if r.status_code != 200: return None
+            for chunk in r.iter_content(64 * 1024):
+                if not self._live(gen): return None
+                buf.write(chunk)
+                if buf.tell() > MAX_ICON_BYTES: return None
+        buf.seek(0)
+        with Image.open(buf) as src:
+            src.draft("RGB", self.size)  # lets JPEG decode at reduced scale
+            img = src.convert("RGBA")
+            img.thumbnail(self.size, Image.Resampling.LANCZOS)
+        self._to_disk(url, img)
+        return img
+
+    def _to_disk(self, url, img):
+        path = self._disk_path(url)
+        tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        img.save(tmp, format="PNG")
+        os.replace(tmp, path)
+        with self._lock:
+            if self._disk_usage is None: self._disk_usage = self._scan_disk()
+            else: self._disk_usage += os.path.getsize(path)
+            if self._disk_usage > self.disk_bytes: self._evict()
+
+    def _scan_disk(self):
+        total = 0
+        for e in os.scandir(self.cache_dir):
+            if e.name.endswith(".png"): total += e.stat().st_size
+        return total
+
+    def _evict(self):
+        # Oldest-used first, down to 80% of the cap so we don't evict on every write
+        entries = sorted((e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(self.cache_dir) if e.name.endswith(".png"))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.disk_bytes * 0.8: break
+            try:
+                os.remove(path); total -= size
+            except OSError: pass
+        self._disk_usage = total
@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from orbus.fsutil import atomic_write_json, file_lock
+from orbus.metacache import FABRIC_LOADERS_URL, QUILT_LOADERS_URL
+from orbus.launchtimes import span
+
+# -------------------------
+# Install State Manifest
+# -------------------------
+# Records which launch version ids (vanilla, fabric-loader-..., quilt-loader-...)
+# were fully installed and verified, together with a cheap fingerprint of what
+# was on disk at the time. As long as the fingerprint still matches, launch()
+# can skip minecraft_launcher_lib's install/verify pass entirely.
+
+def maven_path(name):
+    # "group:artifact:version[:classifier]" -> group/artifact/version/artifact-version[-classifier].jar
+    parts = name.split(":")
+    if len(parts) < 3: return None
+    group, artifact, version = parts[:3]
+    classifier = f"-{parts[3]}" if len(parts) > 3 else ""
+    return os.path.join(*group.split("."), artifact, version, f"{artifact}-{version}{classifier}.jar")
+
+def version_chain(version_id, mc_dir):
+    # Yields (id, parsed json) for the version and everything it inherits from.
+    seen = set()
+    while version_id and version_id not in seen:
+        seen.add(version_id)
+        path = os.path.join(mc_dir, "versions", version_id, f"{version_id}.json")
+        with open(path, "r", encoding="utf-8") as f: data = json.load(f)
+        yield version_id, data
+        version_id = data.get("inheritsFrom")
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+    except OSError: return None
+
+def fingerprint(version_id, mc_dir):
+    # Only stats files: version JSONs and jars along the inheritance chain, every
+    # library they list, and the asset index. Returns None if anything in the
+    # chain isn't installed at all.
+    parts = []
+    lib_dir = os.path.join(mc_dir, "libraries")
+    try:
+        for vid, data in version_chain(version_id, mc_dir):
+            vdir = os.path.join(mc_dir, "versions", vid)
+            parts.append([vid, _stat(os.path.join(vdir, f"{vid}.json")), _stat(os.path.join(vdir, f"{vid}.jar"))])
+            libs = 0
+            for lib in data.get("libraries", []):
+                rel = lib.get("downloads", {}).get("artifact", {}).get("path") or maven_path(lib.get("name", ""))
+                if not rel: continue
+                st = _stat(os.path.join(lib_dir, rel))
+                if st: libs += 1
+                parts.append(st and st[1])
+            parts.append(libs)
+            asset_id = data.get("assetIndex", {}).get("id")
+            if asset_id: parts.append(_stat(os.path.join(mc_dir, "assets", "indexes", f"{asset_id}.json")))
+    except (OSError, ValueError): return None
+    return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+
+
+class InstallState:
+    def __init__(self, path, mc_dir):
+        self.path = path
+        self.mc_dir = mc_dir
+        self.lock_file = os.path.join(mc_dir, "orbus_install.lock")
+        self._lock = threading.Lock()
+        self._state = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f: return json.load(f)
+        except (OSError, ValueError): return {}
+
+    def fingerprint(self, version_id):
+        return fingerprint(version_id, self.mc_dir)
+
+    def is_verified(self, version_id, fp=None):
+        fp = fp or self.fingerprint(version_id)
+        if not fp: return False
+        entry = self._state.get(version_id)
+        if not entry or entry.get("fingerprint") != fp:
+            # Another process may have installed it since we loaded
+            self._state = self._read()
+            entry = self._state.get(version_id)
+        return bool(entry and entry.get("fingerprint") == fp)
+
+    def mark_verified(self, version_id):
+        fp = self.fingerprint(version_id)
+        if not fp: return
+        with self._lock, file_lock(self.path + ".lock"):
+            self._state = self._read()
+            self._state[version_id] = {"fingerprint": fp, "verified_at": time.time()}
+            atomic_write_json(self.path, self._state)
+
+    def invalidate(self, version_id):
+        with self._lock, file_lock(self.path + ".lock"):
+            self._state = self._read()
+            if self._state.pop(version_id, None) is not None: atomic_write_json(self.path, self._state)
+
+
+# -------------------------
+# Version Resolution / Install
+# -------------------------
+def resolve_version_id(meta, version, loader, loader_version="latest"):
+    # Returns (launch version id, concrete loader version) without installing anything.
+    if loader == "Fabric":
+        lv = loader_version if loader_version and loader_version != "latest" else meta.latest_loader(FABRIC_LOADERS_URL)
+        return f"fabric-loader-{lv}-{version}", lv
+    if loader == "Quilt":
+        lv = meta.latest_loader(QUILT_LOADERS_URL)
+        return f"quilt-loader-{lv}-{version}", lv
+    return str(version), None
+
+def ensure_installed(state, version, loader, loader_version, version_id, callback=None, force=False, timer=None):
+    # Runs the full install/verify pass unless the manifest says version_id is
+    # already good. Returns True if it had to install.
+    if not force:
+        with span(timer, "install"):
+            if state.is_verified(version_id): return False
+    import minecraft_launcher_lib
+    callback = callback or {}
+    # Installs into the shared .minecraft are serialised across processes
+    with file_lock(state.lock_file):
+        with span(timer, "install"):
+            if not force and state.is_verified(version_id): return False
+            minecraft_launcher_lib.install.install_minecraft_version(version, state.mc_dir, callback=callback)
+        with span(timer, "loader_install"):
+            if loader == "Fabric":
+                minecraft_launcher_lib.fabric.install_fabric(version, state.mc_dir, loader_version=loader_version, callback=callback)
+            elif loader == "Quilt":
+                minecraft_launcher_lib.quilt.install_quilt(version, state.mc_dir, loader_version=loader_version, callback=callback)
+        state.mark_verified(version_id)
+    return True
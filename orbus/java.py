@@ -0,0 +1,179 @@
+import os
+import sys
+import re
+import json
+import shutil
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from orbus.fsutil import atomic_write_json
+
+# -------------------------
+# Java Scanner
+# -------------------------
+PROBE_WORKERS = 8
+_cache_lock = threading.Lock()
+
+def _search_dirs():
+    if sys.platform == "win32":
+        return [r"C:\Program Files\Java", r"C:\Program Files (x86)\Java", r"C:\Program Files\Eclipse Adoptium", r"C:\Program Files\Microsoft", r"C:\Program Files\BellSoft", r"C:\Program Files\Azul Systems", r"C:\ProgramData\Oracle\Java", r"C:\Program Files\Amazon Corretto"]
+    elif sys.platform.startswith("linux"):
+        return ["/usr/lib/jvm", "/opt", "/usr/java"]
+    elif sys.platform == "darwin":
+        return ["/Library/Java/JavaVirtualMachines"]
+    return []
+
+def find_java_candidates(deep=False, search_dirs=None):
+    java_paths = set()
+    if os.environ.get("JAVA_HOME"):
+        java_paths.add(os.path.join(os.environ["JAVA_HOME"], "bin", "javaw.exe" if sys.platform == "win32" else "java"))
+
+    for candidate in ("javaw", "java", "java.exe", "javaw.exe"):
+        p = shutil.which(candidate)
+        if p: java_paths.add(os.path.abspath(p))
+
+    for pdir in os.environ.get("PATH", "").split(os.pathsep):
+        try:
+            if not os.path.isdir(pdir): continue
+            for fname in os.listdir(pdir):
+                if fname.lower().startswith("java") and os.access(os.path.join(pdir, fname), os.X_OK):
+                    java_paths.add(os.path.abspath(os.path.join(pdir, fname)))
+        except OSError: pass
+
+    max_depth = 8 if deep else 4
+    targets = ("javaw.exe", "java.exe") if sys.platform == "win32" else ("java",)
+    for root_dir in (search_dirs if search_dirs is not None else _search_dirs()):
+        if not os.path.exists(root_dir): continue
+        base_depth = root_dir.rstrip(os.sep).count(os.sep)
+        for dirpath, dirnames, filenames in os.walk(root_dir):
+            for t in targets:
+                if t in filenames: java_paths.add(os.path.abspath(os.path.join(dirpath, t)))
+            # Prune here rather than skipping files below the limit, otherwise
+            # os.walk still descends the whole tree.
+            if dirpath.count(os.sep) - base_depth >= max_depth: dirnames[:] = []
+
+    normalized = set()
+    for p in java_paths:
+        try:
+            rp = os.path.realpath(p)
+            if os.path.isfile(rp) and os.access(rp, os.X_OK): normalized.add(rp)
+        except OSError: pass
+    return normalized
+
+def probe_java(path):
+    try:
+        proc = subprocess.run([path, "-version"], capture_output=True, text=True, timeout=2)
+        output = (proc.stderr or "") + (proc.stdout or "")
+        if not re.search(r'(?i)\b(java version|openjdk|hotspot|graalvm|jre|jdk|java\(tm\)|java virtual machine|runtime environment)\b', output): return None
+        version_match = re.search(r'version "([^\"]+)"', output)
+        return {"path": path, "version": version_match.group(1) if version_match else "Unknown", "arch": "64-bit" if "64-bit" in output else "32-bit"}
+    except (OSError, subprocess.SubprocessError): return None
+
+# --- Probe cache ---
+# Keyed by realpath; an entry is reused while the binary's mtime and size are
+# unchanged, so repeat scans only launch `java -version` for new or updated JDKs.
+def _fingerprint(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+def load_java_cache(cache_file):
+    if not cache_file: return {}
+    try:
+        with open(cache_file, "r") as f: return json.load(f)
+    except (OSError, ValueError): return {}
+
+def save_java_cache(cache_file, cache):
+    if not cache_file: return
+    atomic_write_json(cache_file, cache)
+
+def _sorted(results):
+    return sorted(results, key=lambda x: x['version'], reverse=True)
+
+def cached_javas(cache_file):
+    # Instant answer from the last scan, minus anything that changed on disk since.
+    results = []
+    for path, entry in load_java_cache(cache_file).items():
+        try:
+            if entry.get("info") and entry.get("fp") == _fingerprint(path): results.append(entry["info"])
+        except OSError: pass
+    return _sorted(results)
+
+def java_info(path, cache_file=None):
+    # Probe result for one binary, through the same cache the scanner uses
+    resolved = path if os.path.isabs(path) else shutil.which(path)
+    if not resolved: return None
+    rp = os.path.realpath(resolved)
+    try: fp = _fingerprint(rp)
+    except OSError: return None
+    with _cache_lock: entry = load_java_cache(cache_file).get(rp)
+    if entry and entry.get("fp") == fp: return entry.get("info")
+    info = probe_java(rp)
+    with _cache_lock:
+        cache = load_java_cache(cache_file)
+        cache[rp] = {"fp": fp, "info": info}
+        save_java_cache(cache_file, cache)
+    return info
+
+GC_FLAGS = {"zgc": "UseZGC", "shenandoah": "UseShenandoahGC"}
+
+def probe_gcs(path):
+    # PrintFlagsFinal lists the Use*GC flags even on builds that leave the
+    # collector out, so start the JVM with each one and see if it comes up
+    gcs = {}
+    for gc, flag in GC_FLAGS.items():
+        try:
+            proc = subprocess.run([path, "-XX:+UnlockExperimentalVMOptions", f"-XX:+{flag}", "-version"], capture_output=True, timeout=5)
+        except (OSError, subprocess.SubprocessError): return {}
+        gcs[gc] = proc.returncode == 0
+    return gcs
+
+def java_gcs(path, cache_file=None):
+    # {"zgc": bool, "shenandoah": bool}, stored next to the probe result
+    resolved = path if os.path.isabs(path) else shutil.which(path)
+    if not resolved: return {}
+    rp = os.path.realpath(resolved)
+    try: fp = _fingerprint(rp)
+    except OSError: return {}
+    with _cache_lock: entry = load_java_cache(cache_file).get(rp)
+    if entry and entry.get("fp") == fp and "gc_support" in entry: return entry["gc_support"]
+    gcs = probe_gcs(rp)
+    with _cache_lock:
+        cache = load_java_cache(cache_file)
+        entry = cache.get(rp)
+        if entry and entry.get("fp") == fp:
+            entry["gc_support"] = gcs
+            save_java_cache(cache_file, cache)
+    return gcs
+
+def java_major(version):
+    # "17.0.2" -> 17, "1.8.0_292" -> 8, anything unparseable -> None
+    m = re.match(r"(\d+)(?:\.(\d+))?", version or "")
+    if not m: return None
+    major = int(m.group(1))
+    return int(m.group(2) or 0) if major == 1 else major
+
+def find_system_javas_enhanced(deep=False, cache_file=None, workers=PROBE_WORKERS, search_dirs=None):
+    candidates = find_java_candidates(deep, search_dirs)
+    with _cache_lock: cache = load_java_cache(cache_file)
+    results, to_probe = [], []
+    for p in sorted(candidates):
+        try: fp = _fingerprint(p)
+        except OSError: continue
+        entry = cache.get(p)
+        if entry and entry.get("fp") == fp:
+            if entry.get("info"): results.append(entry["info"])
+        else: to_probe.append((p, fp))
+
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=min(workers, len(to_probe)), thread_name_prefix="orbus-java") as pool:
+            for (p, fp), info in zip(to_probe, pool.map(probe_java, [p for p, _ in to_probe])):
+                # Failed probes are cached too so broken binaries aren't retried every scan.
+                cache[p] = {"fp": fp, "info": info}
+                if info: results.append(info)
+
+    with _cache_lock:
+        merged = load_java_cache(cache_file)
+        merged.update(cache)
+        save_java_cache(cache_file, {p: e for p, e in merged.items() if os.path.exists(p)})
+    return _sorted(results)
@@ -0,0 +1,79 @@
+import os
+
+# -------------------------
+# JVM Memory & GC Profiles
+# -------------------------
+# Per instance: a GC profile plus either a fixed heap ("ram": GB) or
+# "ram": "auto", sized from host memory, the mods folder and the Java version.
+# -Xms stays well below -Xmx so small packs don't commit the whole heap.
+PROFILES = {"balanced": "Balanced (G1)", "low-latency": "Low latency (ZGC/Shenandoah)", "minimal": "Minimal footprint"}
+DEFAULT_PROFILE = "balanced"
+
+AUTO_BASE_MB = 2048      # vanilla plus a little headroom
+AUTO_PER_MOD_MB = 32
+AUTO_MIN_MB = 1024
+OS_RESERVE_MB = 2048     # left for the OS and the JVM's own off-heap memory
+OLD_JAVA_MAX_MB = 8192   # Java 8's G1 pauses grow badly past this
+COMPRESSED_OOPS_MB = 31 * 1024
+
+
+def host_memory():
+    # (total MB, available MB), None when unknown
+    try:
+        info = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                info[key] = int(rest.split()[0]) // 1024
+        total = info["MemTotal"]
+        return total, info.get("MemAvailable", total // 2)
+    except (OSError, KeyError, ValueError, IndexError): pass
+    try:
+        total = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+        return total, total // 2
+    except (AttributeError, ValueError, OSError): return None
+
+def count_mods(inst_dir):
+    try: return sum(1 for f in os.listdir(os.path.join(inst_dir, "mods")) if f.endswith(".jar"))
+    except OSError: return 0
+
+def auto_heap_mb(mods, java_major=None, profile=DEFAULT_PROFILE, memory=None):
+    want = AUTO_BASE_MB + AUTO_PER_MOD_MB * mods
+    # Concurrent collectors need headroom to keep up with allocation
+    if profile == "low-latency": want = want * 5 // 4
+    cap = COMPRESSED_OOPS_MB if (java_major or 8) >= 11 else OLD_JAVA_MAX_MB
+    memory = memory or host_memory()
+    if memory:
+        total, available = memory
+        cap = min(cap, max(AUTO_MIN_MB, min(total - max(OS_RESERVE_MB, total // 4), available - 512)))
+    return max(AUTO_MIN_MB, min(want, cap)) // 256 * 256
+
+def heap_mb(settings, inst_dir, java_major=None):
+    ram = settings.get("ram", 4)
+    if ram == "auto": return auto_heap_mb(count_mods(inst_dir), java_major, settings.get("jvm_profile", DEFAULT_PROFILE))
+    return int(ram) * 1024
+
+def _g1(heap, pause):
+    return ["-XX:+UseG1GC", f"-XX:MaxGCPauseMillis={pause}", f"-XX:G1HeapRegionSize={16 if heap >= 8192 else 8}M",
+            "-XX:+UnlockExperimentalVMOptions", "-XX:G1NewSizePercent=20", "-XX:G1MaxNewSizePercent=40",
+            "-XX:G1ReservePercent=20", "-XX:InitiatingHeapOccupancyPercent=15", "-XX:+ParallelRefProcEnabled"]
+
+def _low_latency(heap, major, gcs):
+    if gcs.get("zgc") and major >= 15:
+        args = ["-XX:+UseZGC", f"-XX:SoftMaxHeapSize={heap * 4 // 5}m"]
+        # Generational ZGC is opt-in on 21-22 and the only mode from 23
+        if 21 <= major < 23: args.append("-XX:+ZGenerational")
+        return args
+    if gcs.get("shenandoah"): return ["-XX:+UnlockExperimentalVMOptions", "-XX:+UseShenandoahGC"]
+    return _g1(heap, 25)
+
+def jvm_args(profile, heap, java_major=None, gcs=None):
+    major = java_major or 8
+    if profile == "minimal":
+        args = [f"-Xmx{heap}m", "-Xms256m", "-XX:+UseG1GC", "-XX:MinHeapFreeRatio=10", "-XX:MaxHeapFreeRatio=30", "-XX:+UseStringDeduplication"]
+        # Hand idle heap back to the OS
+        if major >= 12: args.append("-XX:G1PeriodicGCInterval=30000")
+        return args
+    xms = min(heap, max(512, heap // 4))
+    gc = _low_latency(heap, major, gcs or {}) if profile == "low-latency" else _g1(heap, 50)
+    return [f"-Xmx{heap}m", f"-Xms{xms}m"] + gc + ["-XX:+DisableExplicitGC"]
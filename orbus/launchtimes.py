@@ -0,0 +1,112 @@
+import os
+import json
+import math
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+
+# -------------------------
+# Launch Phase Timing
+# -------------------------
+# A LaunchTimer goes along with one launch: core records spans for each phase,
+# the session manager marks the first line of output and "ready", which a
+# streaming match on the game log detects. Finished records are appended to
+# <instance>/.orbus/launch_times.jsonl, newest last.
+PHASES = ("config", "prefetch_wait", "loader_resolve", "install", "loader_install", "java", "command", "spawn")
+MARKS = ("first_output", "ready")
+PHASE_LABELS = {
+    "config": "Config snapshot", "prefetch_wait": "Wait for prefetch", "loader_resolve": "Loader resolve",
+    "install": "Version install/verify", "loader_install": "Loader install", "java": "Java selection",
+    "command": "Command build", "spawn": "Process spawn", "first_output": "First output", "ready": "Game ready",
+}
+# Logged once the title screen is about to show (OpenAL... on old versions)
+READY_MARKERS = ("Sound engine started", "OpenAL initialized")
+HISTORY_FILE = os.path.join(".orbus", "launch_times.jsonl")
+HISTORY_KEEP = 100
+
+
+class LaunchTimer:
+    def __init__(self):
+        self.started = time.time()
+        self._t0 = time.monotonic()
+        self.phases = {}
+        self.marks = {}
+        self.info = {}
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return time.monotonic() - self._t0
+
+    @contextmanager
+    def span(self, phase):
+        start = time.monotonic()
+        try: yield
+        finally:
+            with self._lock: self.phases[phase] = self.phases.get(phase, 0) + time.monotonic() - start
+
+    def mark(self, name):
+        # First call wins; seconds since the launch started
+        with self._lock: self.marks.setdefault(name, self.elapsed())
+
+    def record(self, **extra):
+        with self._lock:
+            return dict(time=self.started, phases={k: round(v, 4) for k, v in self.phases.items()},
+                        **{k: round(v, 4) for k, v in self.marks.items()}, **self.info, **extra)
+
+def span(timer, phase):
+    # timer.span(phase), or nothing when the caller isn't timing
+    return timer.span(phase) if timer else nullcontext()
+
+
+class ReadyMatcher:
+    # Fed every output line; True once, on the first line with a ready marker
+    def __init__(self, markers=READY_MARKERS):
+        self.markers = markers
+        self.matched = False
+
+    def feed(self, line):
+        if self.matched: return False
+        self.matched = any(m in line for m in self.markers)
+        return self.matched
+
+
+# --- History ---
+def history_path(inst_dir):
+    return os.path.join(inst_dir, HISTORY_FILE)
+
+def load_history(inst_dir):
+    records = []
+    try:
+        with open(history_path(inst_dir), encoding="utf-8") as f:
+            for line in f:
+                try: records.append(json.loads(line))
+                except ValueError: pass
+    except OSError: pass
+    return records
+
+def append_history(inst_dir, record, keep=HISTORY_KEEP):
+    path = history_path(inst_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f: f.write(json.dumps(record) + "\n")
+    # Trim lazily, once the file holds twice what we keep
+    records = load_history(inst_dir)
+    if len(records) > 2 * keep:
+        tmp = f"{path}.{os.getpid()}.trim"
+        with open(tmp, "w", encoding="utf-8") as f: f.writelines(json.dumps(r) + "\n" for r in records[-keep:])
+        os.replace(tmp, path)
+
+def percentile(values, p):
+    # Nearest rank
+    if not values: return None
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+def summarize(records, last=20):
+    # {phase or mark: {"last", "p50", "p95", "n"}} over the newest `last` records
+    records = records[-last:]
+    out = {}
+    for key in PHASES + MARKS:
+        vals = [r["phases"].get(key) if key in PHASES else r.get(key) for r in records]
+        vals = [v for v in vals if v is not None]
+        if vals: out[key] = {"last": vals[-1], "p50": percentile(vals, 50), "p95": percentile(vals, 95), "n": len(vals)}
+    return out
@@ -0,0 +1,88 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from orbus.fsutil import atomic_write_json
+
+# -------------------------
+# Metadata Cache
+# -------------------------
+# Small JSON documents (version manifests, loader lists) kept on disk and
+# revalidated with ETag / Last-Modified once they are older than the TTL.
+# A cached copy is always preferred over an error, so the launcher keeps
+# working offline.
+MOJANG_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+FABRIC_LOADERS_URL = "https://meta.fabricmc.net/v2/versions/loader"
+QUILT_LOADERS_URL = "https://meta.quiltmc.org/v3/versions/loader"
+DEFAULT_TTL = 6 * 3600
+
+
+def release_ids(manifest):
+    return [v["id"] for v in manifest.get("versions", []) if v.get("type") == "release"]
+
+def loader_ids(loaders):
+    return [v["version"] for v in loaders]
+
+
+class MetaCache:
+    def __init__(self, cache_dir, session, ttl=DEFAULT_TTL, timeout=10):
+        self.cache_dir = cache_dir
+        self.session = session
+        self.ttl = ttl
+        self.timeout = timeout
+        self._entries = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _entry(self, url):
+        with self._lock:
+            if url not in self._entries:
+                try:
+                    with open(self._path(url), "r") as f: self._entries[url] = json.load(f)
+                except (OSError, ValueError): self._entries[url] = None
+            return self._entries[url]
+
+    def _store(self, url, entry):
+        with self._lock:
+            self._entries[url] = entry
+            atomic_write_json(self._path(url), entry)
+
+    def peek(self, url):
+        # Whatever is on disk, however old. Never touches the network.
+        entry = self._entry(url)
+        return entry["data"] if entry else None
+
+    def is_fresh(self, url):
+        entry = self._entry(url)
+        return bool(entry) and time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def get_json(self, url, force=False):
+        entry = self._entry(url)
+        if entry and not force and self.is_fresh(url): return entry["data"]
+        headers = {}
+        if entry:
+            if entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            r = self.session.get(url, headers=headers, timeout=self.timeout)
+            if r.status_code == 304 and entry:
+                self._store(url, dict(entry, fetched_at=time.time()))
+                return entry["data"]
+            r.raise_for_status()
+            data = r.json()
+        except Exception:
+            if entry: return entry["data"]
+            raise
+        self._store(url, {"url": url, "etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified"), "fetched_at": time.time(), "data": data})
+        return data
+
+    def latest_loader(self, url):
+        # Within the TTL this is a cache hit; past it, one conditional request
+        # (usually a 304), falling back to the cached list when offline.
+        data = self.get_json(url)
+        return data[0]["version"]
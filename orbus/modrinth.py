@@ -0,0 +1,50 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+
+# -------------------------
+# Modrinth Search Client
+# -------------------------
+API_URL = "https://api.modrinth.com/v2"
+MODPACK_FACETS = json.dumps([["project_type:modpack"], ["categories:fabric", "categories:quilt"]])
+
+
+class ModrinthSearch:
+    # Paged search with a TTL cache of (query, offset) -> page. Generation
+    # tokens let the UI drop responses that arrive after a newer search began.
+    def __init__(self, session, page_size=20, ttl=300, max_pages=128, timeout=10):
+        self.session = session
+        self.page_size = page_size
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self._token = 0
+
+    def new_token(self):
+        with self._lock:
+            self._token += 1
+            return self._token
+
+    def is_current(self, token):
+        return token == self._token
+
+    def search(self, query, offset=0, facets=MODPACK_FACETS):
+        key = (query.strip(), offset, facets)
+        with self._lock:
+            hit = self._pages.get(key)
+            if hit and time.monotonic() - hit[0] < self.ttl:
+                self._pages.move_to_end(key)
+                return hit[1]
+        params = {"query": key[0], "facets": facets, "limit": self.page_size, "offset": offset}
+        r = self.session.get(f"{API_URL}/search", params=params, timeout=self.timeout)
+        r.raise_for_status()
+        data = r.json()
+        page = {"hits": data.get("hits", []), "offset": offset, "total_hits": data.get("total_hits", 0)}
+        with self._lock:
+            self._pages[key] = (time.monotonic(), page)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages: self._pages.popitem(last=False)
+        return page
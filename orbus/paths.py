@@ -0,0 +1,27 @@
+import os
+import sys
+
+# -------------------------
+# Configuration & Globals
+# -------------------------
+# ORBUS_MINECRAFT_DIR points everything at another tree, e.g. a scratch
+# directory per test rig.
+def get_minecraft_dir():
+    if os.environ.get("ORBUS_MINECRAFT_DIR"):
+        return os.path.abspath(os.environ["ORBUS_MINECRAFT_DIR"])
+    if sys.platform.startswith("win"):
+        return os.path.join(os.environ["APPDATA"], ".minecraft")
+    return os.path.expanduser("~/.minecraft")
+
+MINECRAFT_DIR = get_minecraft_dir()
+INSTANCES_DIR = os.path.join(MINECRAFT_DIR, "orbus_instances")
+CONFIG_FILE = os.path.join(MINECRAFT_DIR, "orbus_config.json")  # Legacy single-file config, migrated on first start
+CONFIG_DIR = os.path.join(MINECRAFT_DIR, "orbus_config")
+STORE_DIR = os.path.join(MINECRAFT_DIR, "orbus_store")
+DOWNLOADS_DIR = os.path.join(MINECRAFT_DIR, "orbus_downloads")
+JAVA_CACHE_FILE = os.path.join(MINECRAFT_DIR, "orbus_java_cache.json")
+META_CACHE_DIR = os.path.join(MINECRAFT_DIR, "orbus_meta_cache")
+INSTALL_STATE_FILE = os.path.join(MINECRAFT_DIR, "orbus_install_state.json")
+COMMAND_CACHE_FILE = os.path.join(MINECRAFT_DIR, "orbus_command_cache.json")
+ICON_CACHE_DIR = os.path.join(MINECRAFT_DIR, "orbus_icon_cache")
+ICON_PATH = os.path.join(MINECRAFT_DIR, "orbus_icon.png")
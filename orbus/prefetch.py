@@ -0,0 +1,106 @@
+import threading
+
+from orbus.tasks import PRIORITY_BACKGROUND, PRIORITY_LAUNCH
+from orbus.installstate import resolve_version_id, ensure_installed
+from orbus.launchtimes import span
+
+# -------------------------
+# Install Prefetcher
+# -------------------------
+# Installs an instance's version + loader at background priority as soon as it
+# is likely to be launched (created, imported, selected). Work runs on the
+# scheduler's own single-worker "prefetch" pool, so a paused prefetch never
+# takes a worker from user or launch tasks. It pauses at each install step
+# while a game or launch holds background work; mid-install it gives up the
+# install lock instead and is requeued to resume later. When the user hits
+# Launch, ensure() promotes the matching prefetch to launch priority and waits
+# on it, cancels other selection-driven prefetches (sticky ones just pause
+# until the game exits), and only then runs its own (usually instant)
+# verification pass.
+
+class _Preempted(Exception):
+    pass
+
+
+class Prefetcher:
+    def __init__(self, scheduler, meta, state):
+        self.scheduler = scheduler
+        self.meta = meta
+        self.state = state
+        self._tasks = {}       # (version, loader, loader_version) -> Task
+        self._recent = None    # key of the last non-sticky request
+        self._sticky = set()   # keys of sticky requests not yet finished
+        self._lock = threading.Lock()
+        self._install_lock = threading.Lock()  # one minecraft_launcher_lib install at a time
+
+    def request(self, version, loader, loader_version="latest", sticky=False):
+        # Non-sticky requests (plain selection) replace each other; sticky ones
+        # (new or imported instances) run to completion.
+        if not version: return None
+        key = (version, loader or "Vanilla", loader_version or "latest")
+        with self._lock:
+            task = self._tasks.get(key)
+            if task and not task.done(): return task
+            old = None if sticky or self._recent in self._sticky else self._tasks.get(self._recent)
+            if sticky: self._sticky.add(key)
+            else: self._recent = key
+            task = self.scheduler.submit(self._run, key, name=f"Prefetch {key[0]} {key[1]}", kind="prefetch", priority=PRIORITY_BACKGROUND, silent=True)
+            self._tasks[key] = task
+        if old and not old.done(): old.cancel()
+        return task
+
+    def _run(self, task, key):
+        task.checkpoint()
+        version, loader, loader_version = key
+        preempted = False
+        try:
+            version_id, actual = resolve_version_id(self.meta, version, loader, loader_version)
+            if self.state.is_verified(version_id): return version_id
+            def step():
+                # Never park while holding the install lock
+                if self.scheduler.should_yield(task): raise _Preempted()
+                task.checkpoint()
+            def set_status(text):
+                task.report(message=text)
+                step()
+            callback = {"setStatus": set_status, "setProgress": lambda _: step()}
+            while not self._install_lock.acquire(timeout=0.5): task.checkpoint()
+            try:
+                step()
+                ensure_installed(self.state, version, loader, actual, version_id, callback=callback)
+            finally: self._install_lock.release()
+            return version_id
+        except _Preempted:
+            preempted = True
+        finally:
+            with self._lock:
+                if self._tasks.get(key) is task: del self._tasks[key]
+                resume = preempted and not task.cancelled and (key in self._sticky or key == self._recent)
+                if not resume: self._sticky.discard(key)
+        # Installs are idempotent, so resuming is just running it again
+        if resume: self.request(version, loader, loader_version, sticky=key in self._sticky)
+
+    def ensure(self, version, loader, loader_version="latest", callback=None, force=False, timer=None):
+        # Called from the launch task. Returns (version id, loader version, installed).
+        key = (version, loader or "Vanilla", loader_version or "latest")
+        with self._lock:
+            mine = self._tasks.get(key)
+            others = [t for k, t in self._tasks.items() if k != key and k not in self._sticky]
+            if mine and mine.state == "queued":
+                # Stuck behind paused prefetches; the same work runs inline below
+                del self._tasks[key]
+                self._sticky.discard(key)
+                mine.cancel()
+                mine = None
+        for t in others: t.cancel()
+        if mine and not mine.done():
+            mine.promote(PRIORITY_LAUNCH)
+            if callback and "setStatus" in callback: callback["setStatus"]("Finishing background install...")
+            with span(timer, "prefetch_wait"):
+                try: mine.wait()
+                except Exception: pass  # whatever it missed is picked up below
+        with span(timer, "loader_resolve"):
+            version_id, actual = resolve_version_id(self.meta, version, loader, loader_version)
+        with self._install_lock:
+            installed = ensure_installed(self.state, version, loader, actual, version_id, callback=callback, force=force, timer=timer)
+        return version_id, actual, installed
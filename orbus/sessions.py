@@ -0,0 +1,159 @@
+import time
+import itertools
+import threading
+from collections import OrderedDict
+
+from orbus.gamelog import LogRing
+from orbus import telemetry
+from orbus.launchtimes import ReadyMatcher, append_history, span
+
+# -------------------------
+# Game Sessions
+# -------------------------
+# Any number of running games, several per instance if wanted. A session owns
+# its process, a LogRing with its live output (the full log still goes to
+# orbus_logs) and, once it ends, the exit code. One blocking waiter thread per
+# process reports the exit, so nothing polls. While a game runs, background
+# tasks are held under a per-pid reason, and where /proc exists a telemetry
+# Sampler records the game's resource use. Launches started with a LaunchTimer
+# get "first_output" and "ready" marks and land in the instance's history.
+KEEP_FINISHED = 20
+
+
+class Session:
+    def __init__(self, sid, instance, inst_dir=None, timer=None):
+        self.id = sid
+        self.instance = instance
+        self.inst_dir = inst_dir
+        self.timer = timer
+        self.recorded = False
+        self.process = None
+        self.pid = None
+        self.ring = LogRing()
+        self.started = time.time()
+        self.ended = None
+        self.exit_code = None
+        self.telemetry = None
+        self._done = threading.Event()
+
+    @property
+    def running(self):
+        return not self._done.is_set()
+
+    def uptime(self):
+        return (self.ended or time.time()) - self.started
+
+    def wait(self, timeout=None):
+        # True once the process has exited and its output is fully read
+        return self._done.wait(timeout)
+
+    def stop(self, grace=10):
+        # terminate now, kill after grace seconds if the game ignores it
+        if not self.running: return
+        try: self.process.terminate()
+        except OSError: return
+        timer = threading.Timer(grace, self._kill)
+        timer.daemon = True
+        timer.start()
+
+    def _kill(self):
+        if not self.running: return
+        try: self.process.kill()
+        except OSError: pass
+
+
+class SessionManager:
+    def __init__(self, spawn, scheduler=None, keep_finished=KEEP_FINISHED, telemetry_interval=telemetry.DEFAULT_INTERVAL):
+        # spawn(cmd, inst_dir, on_line) -> (process, reader thread), i.e. Orbus.spawn.
+        # telemetry_interval: seconds between samples, 0 to turn sampling off
+        self._spawn = spawn
+        self.scheduler = scheduler
+        self.keep_finished = keep_finished
+        self.telemetry_interval = telemetry_interval
+        self._sessions = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        # callback(session, event), event in "started", "ready", "exited", "removed";
+        # called on whichever thread caused it
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        try: self._subscribers.remove(callback)
+        except ValueError: pass
+
+    def _emit(self, session, event):
+        for cb in list(self._subscribers):
+            try: cb(session, event)
+            except Exception: pass
+
+    def start(self, instance, cmd, inst_dir, on_line=None, timer=None):
+        session = Session(next(self._ids), instance, inst_dir, timer)
+        matcher = ReadyMatcher()
+        def push(line):
+            session.ring.push(line)
+            if timer and not matcher.matched:
+                timer.mark("first_output")
+                if matcher.feed(line):
+                    timer.mark("ready")
+                    self._record(session)
+                    self._emit(session, "ready")
+            if on_line: on_line(line)
+        with span(timer, "spawn"):
+            session.process, reader = self._spawn(cmd, inst_dir, on_line=push)
+        session.pid = session.process.pid
+        if self.scheduler: self.scheduler.hold_background(f"game-{session.pid}")
+        if self.telemetry_interval and telemetry.supported():
+            session.telemetry = telemetry.Sampler(session.pid, self.telemetry_interval).start()
+        with self._lock: self._sessions[session.id] = session
+        threading.Thread(target=self._wait, args=(session, reader), name=f"orbus-session-{session.pid}", daemon=True).start()
+        self._emit(session, "started")
+        return session
+
+    def _wait(self, session, reader):
+        code = session.process.wait()
+        if session.telemetry: session.telemetry.stop()
+        reader.join()
+        session.exit_code, session.ended = code, time.time()
+        # Never got ready: still recorded, with the exit code
+        self._record(session, exit_code=code)
+        session.ring.push(f"[Orbus] Process exited with code {code}\n")
+        session._done.set()
+        if self.scheduler: self.scheduler.release_background(f"game-{session.pid}")
+        self._emit(session, "exited")
+        self._prune()
+
+    def _record(self, session, **extra):
+        if not session.timer or session.recorded: return
+        session.recorded = True
+        try: append_history(session.inst_dir, session.timer.record(**extra))
+        except OSError: pass
+
+    def _prune(self):
+        with self._lock:
+            finished = [s for s in self._sessions.values() if not s.running]
+            dropped = finished[:max(0, len(finished) - self.keep_finished)]
+            for s in dropped: del self._sessions[s.id]
+        for s in dropped: self._emit(s, "removed")
+
+    def remove(self, sid):
+        # Forget a finished session
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is None or session.running: return
+            del self._sessions[sid]
+        self._emit(session, "removed")
+
+    def get(self, sid):
+        with self._lock: return self._sessions.get(sid)
+
+    def sessions(self, instance=None):
+        with self._lock: return [s for s in self._sessions.values() if instance is None or s.instance == instance]
+
+    def running(self, instance=None):
+        return [s for s in self.sessions(instance) if s.running]
+
+    def stop_all(self, grace=10):
+        for s in self.running(): s.stop(grace)
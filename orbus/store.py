@@ -0,0 +1,136 @@
+import os
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from orbus.fsutil import clone_file, atomic_write_json, file_lock
+
+# -------------------------
+# Content-Addressed Artifact Store
+# -------------------------
+# Blobs live at <root>/<sha512[:2]>/<sha512[2:]> and are shared by every
+# instance. refs.json maps each owner (instance name) to the hashes it uses,
+# which is what the garbage collector counts when an instance goes away.
+
+def sha512_of(path, chunk_size=1024 * 1024):
+    h = hashlib.sha512()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""): h.update(chunk)
+    return h.hexdigest()
+
+
+class ArtifactStore:
+    def __init__(self, root):
+        self.root = root
+        self.refs_file = os.path.join(root, "refs.json")
+        self._lock = threading.RLock()
+        self._refs = None
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, sha512):
+        sha512 = sha512.lower()
+        return os.path.join(self.root, sha512[:2], sha512[2:])
+
+    def has(self, sha512):
+        return os.path.isfile(self.path_for(sha512))
+
+    def stage_jobs(self, jobs):
+        # Splits download jobs into (to_download, links). Jobs with a sha512 are
+        # redirected into the store and skipped entirely when the blob already
+        # exists; links is the list of (sha512, instance_path) to materialize.
+        to_download, links, queued = [], [], set()
+        for job in jobs:
+            sha = (job.get("hashes") or {}).get("sha512", "").lower()
+            if not sha:
+                to_download.append(job); continue
+            links.append((sha, job["dest"]))
+            if sha in queued or self.has(sha): continue
+            queued.add(sha)
+            # Errors and labels keep naming the file, not the blob
+            to_download.append(dict(job, dest=self.path_for(sha), name=job.get("name") or os.path.basename(job["dest"])))
+        return to_download, links
+
+    def materialize(self, sha512, dest):
+        return clone_file(self.path_for(sha512), dest)
+
+    def adopt(self, path, owner=None):
+        # Moves an already-written file into the store and replaces it with a
+        # link back to the blob. Returns the sha512.
+        sha = sha512_of(path)
+        blob = self.path_for(sha)
+        with self._lock:
+            if not os.path.isfile(blob):
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                try: os.link(path, blob)
+                except OSError: clone_file(path, blob, hardlink=False)
+        if not os.path.samefile(path, blob): clone_file(blob, path)
+        if owner: self.add_refs(owner, [sha])
+        return sha
+
+    # --- Reference counting ---
+    def _load_refs(self):
+        if self._refs is None:
+            try:
+                with open(self.refs_file, "r") as f: self._refs = {k: set(v) for k, v in json.load(f).items()}
+            except (OSError, ValueError): self._refs = {}
+        return self._refs
+
+    def _save_refs(self):
+        atomic_write_json(self.refs_file, {k: sorted(v) for k, v in self._refs.items()})
+
+    @contextmanager
+    def _editing_refs(self):
+        # Other processes may share the store: re-read under the file lock,
+        # edit, write back.
+        with self._lock, file_lock(self.refs_file + ".lock"):
+            self._refs = None
+            yield self._load_refs()
+            self._save_refs()
+
+    def add_refs(self, owner, hashes):
+        with self._editing_refs() as refs:
+            refs.setdefault(owner, set()).update(h.lower() for h in hashes)
+
+    def set_refs(self, owner, hashes):
+        # Replaces an owner's references (e.g. a pack re-imported or updated
+        # under the same name) and collects blobs that lost their last one.
+        new = {h.lower() for h in hashes}
+        with self._editing_refs() as refs:
+            dropped = refs.get(owner, set()) - new
+            refs[owner] = new
+            return self._collect(dropped, set().union(*refs.values()))
+
+    def rename_owner(self, old, new):
+        with self._editing_refs() as refs:
+            if old in refs: refs.setdefault(new, set()).update(refs.pop(old))
+
+    def copy_refs(self, src, dst):
+        with self._editing_refs() as refs:
+            if src in refs: refs.setdefault(dst, set()).update(refs[src])
+
+    def release(self, owner):
+        # Drops an owner's references and collects any blob nobody else uses.
+        with self._editing_refs() as refs:
+            dropped = refs.pop(owner, set())
+            return self._collect(dropped, set().union(*refs.values()))
+
+    def gc(self, candidates=None):
+        with self._editing_refs() as refs:
+            return self._collect(self._all_blobs() if candidates is None else candidates, set().union(*refs.values()))
+
+    def _collect(self, candidates, live):
+        removed = 0
+        for sha in candidates:
+            if sha in live: continue
+            try:
+                os.remove(self.path_for(sha)); removed += 1
+            except OSError: pass
+        return removed
+
+    def _all_blobs(self):
+        for prefix in os.listdir(self.root):
+            d = os.path.join(self.root, prefix)
+            if len(prefix) == 2 and os.path.isdir(d):
+                for rest in os.listdir(d):
+                    if len(rest) == 126: yield prefix + rest
@@ -0,0 +1,207 @@
+import queue
+import itertools
+import threading
+
+# -------------------------
+# Background Task Scheduler
+# -------------------------
+# Bounded pools ("net" for downloads/API calls, "disk" for extraction,
+# scanning and other local work, "prefetch" for background installs) fed from
+# priority queues. Background tasks may only occupy all but one worker of a
+# pool, so parked background work can never starve user or launch tasks. Tasks
+# are plain callables that receive their Task as the first argument and use it
+# to report progress and to honour cancellation. Subscribers get (task, event)
+# callbacks on the worker thread for "queued", "started", "progress" and
+# "finished".
+PRIORITY_LAUNCH = 0
+PRIORITY_USER = 10
+PRIORITY_BACKGROUND = 20
+
+_ids = itertools.count(1)
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, scheduler, fn, args, kwargs, name, kind, priority, silent):
+        self.id = next(_ids)
+        self.name = name or getattr(fn, "__name__", "task")
+        self.kind = kind
+        self.priority = priority
+        self.silent = silent
+        self.state = "queued"  # queued, running, done, failed, cancelled
+        self.progress = None   # 0..1, or None while indeterminate
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self._scheduler = scheduler
+        self._fn, self._args, self._kwargs = fn, args, kwargs
+        self._done = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        self._scheduler._requeue(self)
+
+    def checkpoint(self):
+        # Call between units of work: raises if cancelled, and lets
+        # background work step aside while anything more urgent is running.
+        if self.cancelled: raise TaskCancelled(self.name)
+        if self.priority >= PRIORITY_BACKGROUND: self._scheduler._wait_for_foreground(self)
+
+    def promote(self, priority):
+        # e.g. background prefetch picked up by a launch that now waits on it
+        self.priority = min(self.priority, priority)
+        self._scheduler._requeue(self)
+
+    def report(self, progress=None, message=None):
+        if progress is not None: self.progress = max(0.0, min(1.0, progress))
+        if message is not None: self.message = message
+        self._scheduler._emit(self, "progress")
+
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout): raise TimeoutError(self.name)
+        if self.error is not None: raise self.error
+        return self.result
+
+
+class _Pool:
+    def __init__(self, scheduler, kind, workers):
+        self.scheduler = scheduler
+        self.kind = kind
+        self.max_workers = workers
+        self.queue = queue.PriorityQueue()
+        self.threads = []
+        self.seq = itertools.count()
+        self.lock = threading.Lock()
+        # One worker stays free for priority <= PRIORITY_USER work
+        self.background_limit = max(1, workers - 1)
+        self.background_running = 0
+        self.deferred = []
+
+    def put(self, task):
+        self.queue.put((task.priority, next(self.seq), task))
+        with self.lock:
+            # Threads are started lazily, up to max_workers
+            self.threads = [t for t in self.threads if t.is_alive()]
+            if len(self.threads) < self.max_workers:
+                t = threading.Thread(target=self._work, name=f"orbus-{self.kind}-{len(self.threads)}", daemon=True)
+                self.threads.append(t)
+                t.start()
+
+    def requeue(self, task):
+        # A deferred task that got promoted or cancelled goes back in line now
+        with self.lock:
+            if task not in self.deferred: return
+            self.deferred.remove(task)
+        self.put(task)
+
+    def _work(self):
+        while True:
+            _, _, task = self.queue.get()
+            background = task.priority >= PRIORITY_BACKGROUND and not task.cancelled
+            if background:
+                with self.lock:
+                    if self.background_running >= self.background_limit:
+                        # Put aside until a background slot frees up
+                        self.deferred.append(task)
+                        continue
+                    self.background_running += 1
+            try: self.scheduler._run(task)
+            finally:
+                if background:
+                    with self.lock:
+                        self.background_running -= 1
+                        deferred, self.deferred = self.deferred, []
+                    for t in deferred: self.put(t)
+
+
+class TaskScheduler:
+    def __init__(self, net_workers=6, disk_workers=2, prefetch_workers=1):
+        self._pools = {"net": _Pool(self, "net", net_workers), "disk": _Pool(self, "disk", disk_workers), "prefetch": _Pool(self, "prefetch", prefetch_workers)}
+        self._subscribers = []
+        self._active = {}
+        self._holds = set()
+        self._cond = threading.Condition()
+
+    def submit(self, fn, *args, name=None, kind="net", priority=PRIORITY_USER, silent=False, **kwargs):
+        task = Task(self, fn, args, kwargs, name, kind, priority, silent)
+        with self._cond: self._active[task.id] = task
+        self._emit(task, "queued")
+        self._pools[kind].put(task)
+        return task
+
+    def tasks(self):
+        with self._cond: return [t for t in self._active.values() if not t.silent]
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        try: self._subscribers.remove(callback)
+        except ValueError: pass
+
+    def _emit(self, task, event):
+        if task.silent: return
+        for cb in list(self._subscribers):
+            try: cb(task, event)
+            except Exception: pass
+
+    # --- Background throttling ---
+    def hold_background(self, reason):
+        # While any hold is active, background tasks wait at their next checkpoint
+        with self._cond: self._holds.add(reason)
+
+    def release_background(self, reason):
+        with self._cond:
+            self._holds.discard(reason)
+            self._cond.notify_all()
+
+    def _foreground_busy(self):
+        # Only launches that are actually running count; a queued one still needs a worker
+        return bool(self._holds) or any(t.priority <= PRIORITY_LAUNCH and t.state == "running" for t in self._active.values())
+
+    def should_yield(self, task):
+        # True while background work should step aside; for callers that
+        # must not park in checkpoint() (e.g. while holding a lock)
+        with self._cond: return task.priority >= PRIORITY_BACKGROUND and self._foreground_busy()
+
+    def _wait_for_foreground(self, task):
+        with self._cond:
+            while task.priority >= PRIORITY_BACKGROUND and self._foreground_busy() and not task.cancelled: self._cond.wait(0.5)
+        if task.cancelled: raise TaskCancelled(task.name)
+
+    def _wake(self):
+        with self._cond: self._cond.notify_all()
+
+    def _requeue(self, task):
+        self._pools[task.kind].requeue(task)
+        self._wake()
+
+    def _run(self, task):
+        if not task.cancelled:
+            task.state = "running"
+            self._emit(task, "started")
+            try:
+                task.result = task._fn(task, *task._args, **task._kwargs)
+                task.state = "done"
+            except BaseException as e:
+                task.error = e
+                task.state = "cancelled" if task.cancelled or isinstance(e, TaskCancelled) else "failed"
+        else:
+            task.state = "cancelled"
+            task.error = TaskCancelled(task.name)
+        with self._cond:
+            self._active.pop(task.id, None)
+            self._cond.notify_all()
+        task._done.set()
+        self._emit(task, "finished")
@@ -0,0 +1,160 @@
+import os
+import csv
+import time
+import threading
+from array import array
+
+# -------------------------
+# Process Telemetry
+# -------------------------
+# Samples a game JVM and its child processes from /proc/<pid>/stat, status and
+# io. Samples go into a SampleRing: one preallocated array('d') per field, so
+# a long session costs a fixed amount of memory and no per-sample objects.
+# CPU is in percent of one core (like top); disk rates are actual storage I/O.
+FIELDS = ("time", "cpu_percent", "rss_mb", "threads", "read_mb_s", "write_mb_s", "processes")
+DEFAULT_INTERVAL = 1.0
+DEFAULT_CAPACITY = 3600
+CHILD_RESCAN = 10        # look for new child processes every N samples
+MB = 1024 * 1024
+
+
+def supported():
+    return os.path.isfile("/proc/self/stat")
+
+
+class SampleRing:
+    def __init__(self, fields=FIELDS, capacity=DEFAULT_CAPACITY):
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._cols = [array("d", [0.0]) * capacity for _ in self.fields]
+        self._next = 0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def append(self, values):
+        with self._lock:
+            for col, v in zip(self._cols, values): col[self._next] = v
+            self._next = (self._next + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def _order(self):
+        start = (self._next - self.count) % self.capacity
+        return [(start + i) % self.capacity for i in range(self.count)]
+
+    def column(self, field):
+        # Oldest to newest
+        col = self._cols[self.fields.index(field)]
+        with self._lock: return [col[i] for i in self._order()]
+
+    def rows(self):
+        with self._lock: return [tuple(col[i] for col in self._cols) for i in self._order()]
+
+    def last(self):
+        with self._lock:
+            if not self.count: return None
+            i = (self._next - 1) % self.capacity
+            return dict(zip(self.fields, (col[i] for col in self._cols)))
+
+    def write_csv(self, path):
+        rows = self.rows()
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(self.fields)
+            for r in rows: w.writerow([time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r[0]))] + [f"{v:.2f}" for v in r[1:]])
+
+
+# --- /proc readers ---
+def _read(path):
+    with open(path, "rb") as f: return f.read().decode("ascii", "replace")
+
+def read_stat(pid):
+    # -> (ppid, cpu jiffies); comm may contain spaces and parens, so split at the last ")"
+    fields = _read(f"/proc/{pid}/stat").rsplit(")", 1)[1].split()
+    return int(fields[1]), int(fields[11]) + int(fields[12])
+
+def read_status(pid):
+    # -> (rss bytes, threads)
+    rss = threads = 0
+    for line in _read(f"/proc/{pid}/status").splitlines():
+        if line.startswith("VmRSS:"): rss = int(line.split()[1]) * 1024
+        elif line.startswith("Threads:"): threads = int(line.split()[1])
+    return rss, threads
+
+def read_io(pid):
+    # -> (read bytes, write bytes); unreadable (other user, hardened kernel) counts as 0
+    out = {}
+    try:
+        for line in _read(f"/proc/{pid}/io").splitlines():
+            key, _, value = line.partition(":")
+            out[key] = int(value)
+    except (OSError, ValueError): pass
+    return out.get("read_bytes", 0), out.get("write_bytes", 0)
+
+def process_tree(pid):
+    # pid plus every descendant, from one pass over /proc
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit(): continue
+        try: ppid = read_stat(entry)[0]
+        except (OSError, IndexError, ValueError): continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        tree.append(p)
+        stack.extend(children.get(p, ()))
+    return tree
+
+def snapshot(pids):
+    # Totals over pids that still exist -> {pid: (jiffies, read, write)}, rss, threads
+    per_pid, rss, threads = {}, 0, 0
+    for pid in pids:
+        try:
+            _, jiffies = read_stat(pid)
+            r, t = read_status(pid)
+        except (OSError, IndexError, ValueError): continue
+        per_pid[pid] = (jiffies,) + read_io(pid)
+        rss += r
+        threads += t
+    return per_pid, rss, threads
+
+
+class Sampler:
+    def __init__(self, pid, interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY):
+        self.pid = pid
+        self.interval = interval
+        self.ring = SampleRing(FIELDS, capacity)
+        self._stop = threading.Event()
+        self._thread = None
+        self._hz = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"orbus-telemetry-{self.pid}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        pids, n = [self.pid], 0
+        prev, prev_t = None, None
+        while True:
+            if n % CHILD_RESCAN == 0:
+                try: pids = process_tree(self.pid)
+                except OSError: pass
+            n += 1
+            now = time.time()
+            per_pid, rss, threads = snapshot(pids)
+            if self.pid not in per_pid: return
+            if prev is not None:
+                dt = max(now - prev_t, 1e-6)
+                # Deltas only over processes seen both times, so exits and new children don't spike
+                cpu = rd = wr = 0
+                for pid, (j, r, w) in per_pid.items():
+                    if pid in prev:
+                        pj, pr, pw = prev[pid]
+                        cpu += max(0, j - pj); rd += max(0, r - pr); wr += max(0, w - pw)
+                self.ring.append((now, cpu / self._hz / dt * 100, rss / MB, threads, rd / MB / dt, wr / MB / dt, len(per_pid)))
+            prev, prev_t = per_pid, now
+            if self._stop.wait(self.interval): return